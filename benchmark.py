@@ -0,0 +1,267 @@
+# Banc d'essai hors ligne de l'installation : un serveur HTTP local génère un
+# modpack synthétique (N jars, manifest.json, zip) avec ETag et Range, le
+# launcher est lancé en ligne de commande (--check, --install, --verify) contre
+# ce serveur dans un dossier Minecraft temporaire, et les mesures sont écrites
+# dans un fichier JSON pour comparer les commits entre eux.
+#
+#   python benchmark.py --jars 200 --min-kb 64 --max-kb 4096 --output bench.json
+import argparse
+import hashlib
+import http.server
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+
+import psutil
+
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "launcher.py")
+FORGE_VERSION = "1.20.1-47.2.0"
+
+
+# ========== MODPACK SYNTHÉTIQUE ==========
+
+def build_pack(jars, min_kb, max_kb, seed):
+    rng = random.Random(seed)
+    files = {}
+    manifest = []
+    for i in range(jars):
+        name = f"benchmod-{i:04d}.jar"
+        # Contenu peu compressible, comme les classes et assets d'un vrai jar
+        data = rng.randbytes(rng.randint(min_kb, max_kb) * 1024)
+        files["mods/" + name] = data
+        manifest.append({"name": name, "size": len(data), "sha256": hashlib.sha256(data).hexdigest()})
+    
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+        for entry in manifest:
+            zf.writestr("mods/" + entry['name'], files["mods/" + entry['name']])
+    files["pack.zip"] = archive.getvalue()
+    files["manifest.json"] = json.dumps(manifest).encode()
+    return files, manifest
+
+
+# ========== SERVEUR HTTP ==========
+
+class PackHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    files = {}
+    etags = {}
+    
+    def log_message(self, *args):
+        pass
+    
+    def do_GET(self):
+        path = self.path.split('?')[0].lstrip('/')
+        data = self.files.get(path)
+        if data is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        etag = self.etags[path]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        start, end, code = 0, len(data) - 1, 200
+        match = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range', ''))
+        if match and self.headers.get('If-Range', etag) == etag:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else end
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            code = 206
+        self.send_response(code)
+        self.send_header('ETag', etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(end - start + 1))
+        if code == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(data)}')
+        self.end_headers()
+        self.wfile.write(memoryview(data)[start:end + 1])
+
+
+def start_server(files):
+    PackHandler.files = files
+    PackHandler.etags = {path: '"%s"' % hashlib.md5(data).hexdigest() for path, data in files.items()}
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), PackHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ========== MESURES ==========
+
+# Dossier Minecraft isolé. Forge est déclaré « déjà installé » dans le cache du
+# launcher : le banc mesure la partie mods, pas le téléchargement de Forge.
+def make_home(root):
+    home = tempfile.mkdtemp(prefix="home-", dir=root)
+    mc_dir = os.path.join(home, ".minecraft")
+    if sys.platform.startswith("win"):
+        mc_dir = os.path.join(home, "AppData", "Roaming", ".minecraft")
+    elif sys.platform == "darwin":
+        mc_dir = os.path.join(home, "Library", "Application Support", "minecraft")
+    versions = os.path.join(mc_dir, "versions")
+    forge_id = FORGE_VERSION.replace("-", "-forge-", 1)
+    os.makedirs(os.path.join(versions, forge_id))
+    os.makedirs(os.path.join(mc_dir, "loannsmp_cache"))
+    with open(os.path.join(mc_dir, "loannsmp_cache", "forge.json"), 'w') as f:
+        json.dump({
+            'resolved': {'mc_version': "1.20.1", 'forge_version': FORGE_VERSION, 'at': time.time()},
+            'installed': {'mtime_ns': os.stat(versions).st_mtime_ns, 'ids': [forge_id]},
+        }, f)
+    env = dict(os.environ, HOME=home, USERPROFILE=home, APPDATA=os.path.join(home, "AppData", "Roaming"))
+    return env, mc_dir
+
+
+# Lance le launcher en ligne de commande et suit le pic de RSS du processus
+def run_cli(args, env):
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, LAUNCHER] + args, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    peak = 0
+    watched = psutil.Process(process.pid)
+    done = threading.Event()
+    
+    def sample():
+        nonlocal peak
+        while not done.wait(0.02):
+            try:
+                peak = max(peak, watched.memory_info().rss)
+            except psutil.Error:
+                return
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    stdout, stderr = process.communicate()
+    wall = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    
+    events = []
+    for line in stdout.decode('utf-8', errors='replace').splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            pass
+    result = next((e for e in reversed(events) if e.get('event') == 'result'), {})
+    if process.returncode not in (0, 1) or not result:
+        sys.stderr.write(stderr.decode('utf-8', errors='replace'))
+    return {
+        'wall_s': round(wall, 3),
+        'exit_code': process.returncode,
+        'peak_rss_mb': round(peak / (1024 * 1024), 1),
+        'ok': result.get('ok'),
+        # Temps écoulé dans le launcher jusqu'au résultat, démarrage de Python compris
+        'result_s': result.get('t'),
+    }, result, events
+
+
+def phase_rates(result):
+    rates = {}
+    for phase in result.get('phases', []):
+        entry = {'s': phase['s']}
+        if phase.get('bytes'):
+            entry['mb'] = round(phase['bytes'] / (1024 * 1024), 2)
+            entry['mb_per_s'] = round(entry['mb'] / max(phase['s'], 1e-6), 1)
+        rates[phase['label']] = entry
+    return rates
+
+
+def scenario(name, args, env, results):
+    metrics, result, events = run_cli(args, env)
+    if 'phases' in result:
+        metrics['phases'] = phase_rates(result)
+    for key in ('valid', 'message', 'missing', 'corrupted', 'verify_s'):
+        if key in result:
+            metrics[key] = len(result[key]) if isinstance(result[key], list) else result[key]
+    results[name] = metrics
+    print(f"  {name:<22} {metrics['wall_s']:7.2f} s  pic RSS {metrics['peak_rss_mb']:6.1f} MB  ok={metrics['ok']}")
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(LAUNCHER), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai hors ligne de l'installation des mods")
+    parser.add_argument("--jars", type=int, default=150, help="nombre de jars du modpack synthétique")
+    parser.add_argument("--min-kb", type=int, default=32, help="taille minimale d'un jar (Ko)")
+    parser.add_argument("--max-kb", type=int, default=2048, help="taille maximale d'un jar (Ko)")
+    parser.add_argument("--seed", type=int, default=1, help="graine du générateur (même pack à chaque run)")
+    parser.add_argument("--output", help="fichier JSON des résultats (défaut: benchmark-<commit>.json)")
+    parser.add_argument("--keep", action="store_true", help="garde les dossiers temporaires")
+    args = parser.parse_args()
+    
+    files, manifest = build_pack(args.jars, args.min_kb, args.max_kb, args.seed)
+    pack_mb = sum(entry['size'] for entry in manifest) / (1024 * 1024)
+    server = start_server(files)
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+    files["modpack.txt"] = (base_url + "pack.zip").encode()
+    PackHandler.etags["modpack.txt"] = '"%s"' % hashlib.md5(files["modpack.txt"]).hexdigest()
+    print(f"📦 {len(manifest)} jars, {pack_mb:.1f} MB servis sur {base_url}")
+    
+    root = tempfile.mkdtemp(prefix="loannsmp-bench-")
+    results = {}
+    try:
+        base = ["--base-url", base_url]
+        
+        # Mise à jour delta (manifest.json)
+        env, mc_dir = make_home(root)
+        scenario("check_cold", ["--check"] + base, env, results)
+        scenario("install_manifest", ["--install"] + base, env, results)
+        scenario("check_warm", ["--check"] + base, env, results)
+        scenario("install_noop", ["--install"] + base, env, results)
+        scenario("verify", ["--verify"], env, results)
+        
+        # Pack complet en zip : même modpack sans manifest.json
+        manifest_json = files.pop("manifest.json")
+        env, mc_dir = make_home(root)
+        scenario("install_zip", ["--install"] + base, env, results)
+        files["manifest.json"] = manifest_json
+    finally:
+        server.shutdown()
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+    
+    commit = git_commit()
+    report = {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pack': {'jars': len(manifest), 'mb': round(pack_mb, 1), 'min_kb': args.min_kb,
+                 'max_kb': args.max_kb, 'seed': args.seed},
+        'results': results,
+    }
+    output = args.output or f"benchmark-{commit or 'local'}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"📝 Résultats: {output}")
+
+
+if __name__ == "__main__":
+    main()
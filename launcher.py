@@ -1,40 +1,33 @@
 import sys
 import os
-import io
-import zipfile
-import requests
-import shutil
-import minecraft_launcher_lib as mll
-from pathlib import Path
-from packaging import version
 import logging
+import threading
+import queue
 from datetime import datetime
-import hashlib
-import json
-import psutil
+from collections import deque, OrderedDict
+
+import launcher_core as core
+from launcher_core import (CONFIG, MINECRAFT_DIR, STARTUP, STATS_HISTORY, JVM_PROFILES, Installer,
+                            LaunchTimer, StatsSampler, can_rollback, check_installation, cli_main, empty_trash,
+                            format_bytes, is_cli, jvm_profile_stats, last_launch_text, mod_icon_cache_path,
+                            mods_pinned, prepare_launch, read_mod_logo, recommend_heap, record_game_session, rollback_mods, session_summary,
+                            trash_pending, uninstall, update_mod_index, verify_mods)
+
+# Mode ligne de commande : on s'arrête avant d'importer Qt
+if __name__ == "__main__" and is_cli(sys.argv[1:]):
+    sys.exit(cli_main(sys.argv[1:]))
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                               QLabel, QPushButton, QProgressBar, QLineEdit, QTextEdit, 
+                               QLabel, QPushButton, QProgressBar, QLineEdit, QPlainTextEdit, 
                                QTabWidget, QGraphicsOpacityEffect, QFrame, QStackedWidget, 
-                               QCheckBox, QScrollArea, QGridLayout)
+                               QCheckBox, QScrollArea, QGridLayout, QListView)
 from PySide6.QtCore import (Qt, QThread, Signal, QTimer, QProcess, QPropertyAnimation, 
                             QEasingCurve, QRect, QPoint, Property, QUrl, QParallelAnimationGroup,
-                            QSequentialAnimationGroup, QSize, QPropertyAnimation)
-from PySide6.QtGui import QFont, QTextCursor, QColor, QDesktopServices
-
-# ========== CONFIG ==========
-CONFIG = {
-    "base_url": "https://raw.githubusercontent.com/NotLoann/loannsmp-modpack/main/",
-    "ram_gb": 4,
-    "keep_launcher_open": True, # ACTIVÉ PAR DÉFAUT
-    "discord_url": "https://discord.gg/x3GtCqqXXj"
-}
-
-MINECRAFT_DIR = mll.utils.get_minecraft_directory()
-MODS_DIR = os.path.join(MINECRAFT_DIR, "mods")
-VERSION_FILE = os.path.join(MINECRAFT_DIR, "loannsmp_version.json")
-INSTALLED_FORGE_VERSION = None
-
+                            QSequentialAnimationGroup, QSize, QPropertyAnimation, QAbstractListModel,
+                            QModelIndex)
+from PySide6.QtGui import (QFont, QTextCursor, QColor, QDesktopServices, QTextCharFormat,
+                           QPainter, QPen, QBrush, QPolygonF, QImage, QPixmap, QIcon)
+from PySide6.QtCore import QPointF
 
 # ========== CUSTOM CHECKBOX ==========
 
@@ -136,7 +129,7 @@ class AnimatedTabBar(QWidget):
         layout.setSpacing(0)
         
         self.buttons = []
-        self.tabs = ["🎮 Launcher", "⚙️ Options", "📊 Stats", "📝 Console"]
+        self.tabs = ["🎮 Launcher", "⚙️ Options", "🧩 Mods", "📊 Stats", "📝 Console"]
         
         for i, tab in enumerate(self.tabs):
             btn = QPushButton(tab)
@@ -211,12 +204,200 @@ class AnimatedTabBar(QWidget):
         self.update_indicator_position()
 
 
+# ========== SPARKLINE ==========
+
+class Sparkline(QWidget):
+    def __init__(self, color, parent=None):
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.values = ()
+        self.peak = 0.0
+        self.setFixedHeight(36)
+    
+    def set_values(self, values, peak):
+        self.values = values
+        self.peak = peak
+        self.update()
+    
+    def paintEvent(self, event):
+        if len(self.values) < 2:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        w, h = self.width(), self.height() - 2
+        # Échelle sur le pic de session pour que les courbes restent comparables
+        top = self.peak or 1.0
+        step = w / (STATS_HISTORY - 1)
+        x0 = w - step * (len(self.values) - 1)
+        points = [QPointF(x0 + i * step, 1 + h - h * v / top) for i, v in enumerate(self.values)]
+        
+        fill = QColor(self.color)
+        fill.setAlpha(40)
+        area = QPolygonF([QPointF(points[0].x(), h + 1)] + points + [QPointF(points[-1].x(), h + 1)])
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(fill))
+        painter.drawPolygon(area)
+        
+        painter.setPen(QPen(self.color, 1.5))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPolyline(QPolygonF(points))
+        painter.end()
+
+
+# ========== LISTE DES MODS ==========
+
+MOD_ICON_SIZE = 32
+MOD_ICON_MEMORY = 300   # miniatures gardées en mémoire
+MOD_FETCH_BATCH = 100   # lignes ajoutées à la vue à chaque fetchMore
+
+
+# Une ligne par jar, construite depuis l'index des mods (aucune lecture de jar
+# ici). La vue ne reçoit les lignes que par paquets (canFetchMore/fetchMore) et
+# les icônes sont extraites à la demande par IconLoader, quand une ligne est peinte.
+class ModListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []       # (jar, titre, version, texte de recherche, infobulle, entrée d'index)
+        self.visible = []    # indices de self.rows qui passent le filtre
+        self.loaded = 0      # lignes déjà exposées à la vue
+        self.positions = {}  # jar -> position dans self.visible
+        self.query = ""
+        self.icons = OrderedDict()
+        self.requested = set()
+        self.placeholder = self.make_placeholder()
+        self.icon_queue = queue.Queue()
+        self.icon_loader = IconLoader(self.icon_queue)
+        self.icon_loader.icon_ready.connect(self.on_icon_ready)
+        self.icon_loader.finished.connect(self.on_icon_loader_finished)
+    
+    def make_placeholder(self):
+        pixmap = QPixmap(MOD_ICON_SIZE, MOD_ICON_SIZE)
+        pixmap.fill(QColor("#E9ECEF"))
+        return QIcon(pixmap)
+    
+    def set_index(self, index):
+        rows = []
+        for jar, entry in index['jars'].items():
+            mods = entry.get('mods', [])
+            main = mods[0] if mods else {}
+            title = main.get('name') or jar[:-4]
+            if len(mods) > 1:
+                title += f" (+{len(mods) - 1})"
+            version = main.get('version') or entry.get('manifest', {}).get('Implementation-Version', '')
+            tooltip = "\n".join(filter(None, [main.get('description', ''), entry.get('error', '')]))
+            search = " ".join([jar, title, version] + [mod.get('id') or '' for mod in mods]).lower()
+            rows.append((jar, title, version, search, tooltip, entry))
+        rows.sort(key=lambda row: row[1].lower())
+        
+        # Icônes des jars remplacés ou supprimés depuis le dernier chargement
+        jars = index['jars']
+        for jar, _, _, _, _, entry in self.rows:
+            if jar in self.icons and jars.get(jar, {}).get('mtime_ns') != entry.get('mtime_ns'):
+                del self.icons[jar]
+                self.requested.discard(jar)
+        
+        self.beginResetModel()
+        self.rows = rows
+        self.visible = [i for i, row in enumerate(rows) if self.query in row[3]]
+        self.reset_window()
+        self.endResetModel()
+    
+    # Filtrage incrémental : si la recherche prolonge la précédente, on ne
+    # refiltre que les lignes déjà retenues
+    def set_filter(self, text):
+        query = text.strip().lower()
+        if query == self.query:
+            return
+        candidates = self.visible if query.startswith(self.query) else range(len(self.rows))
+        self.beginResetModel()
+        self.visible = [i for i in candidates if query in self.rows[i][3]]
+        self.query = query
+        self.reset_window()
+        self.endResetModel()
+    
+    def reset_window(self):
+        self.loaded = min(MOD_FETCH_BATCH, len(self.visible))
+        self.positions = {self.rows[i][0]: pos for pos, i in enumerate(self.visible)}
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+    
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.visible)
+    
+    def fetchMore(self, parent):
+        count = min(MOD_FETCH_BATCH, len(self.visible) - self.loaded)
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        jar, title, version, _, tooltip, entry = self.rows[self.visible[index.row()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{title}   {version}\n{jar}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.icon(jar, entry)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return tooltip or None
+        return None
+    
+    def icon(self, jar, entry):
+        icon = self.icons.get(jar)
+        if icon is not None:
+            self.icons.move_to_end(jar)
+            return icon
+        if jar not in self.requested:
+            self.requested.add(jar)
+            self.icon_queue.put((jar, entry))
+            if not self.icon_loader.isRunning():
+                self.icon_loader.start(QThread.Priority.LowPriority)
+        return self.placeholder
+    
+    def on_icon_ready(self, jar, image):
+        icon = QIcon(QPixmap.fromImage(image)) if not image.isNull() else self.placeholder
+        self.icons[jar] = icon
+        if len(self.icons) > MOD_ICON_MEMORY:
+            # La miniature reste sur disque : une ligne revue la recharge vite
+            old, _ = self.icons.popitem(last=False)
+            self.requested.discard(old)
+        pos = self.positions.get(jar)
+        if pos is not None and pos < self.loaded:
+            index = self.index(pos)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+    
+    # Une demande arrivée pendant que le thread se terminait
+    def on_icon_loader_finished(self):
+        if not self.icon_queue.empty():
+            self.icon_loader.start(QThread.Priority.LowPriority)
+    
+    def stop(self):
+        self.icon_loader.stop()
+        self.icon_loader.wait()
+
+
 # ========== LOGGER ==========
 
+# Les lignes sont mises en file (thread-safe, bornée) et écrites dans la
+# console par lots toutes les CONSOLE_FLUSH_MS ms, en texte brut coloré.
+# La console ne garde que les CONSOLE_MAX_LINES dernières lignes : un jeu
+# très bavard ne peut ni figer l'interface ni faire grossir la mémoire.
+CONSOLE_MAX_LINES = 20000
+CONSOLE_FLUSH_MS = 100
+
+
 class ColoredTextEditLogger(logging.Handler):
     def __init__(self, text_edit):
         super().__init__()
         self.text_edit = text_edit
+        self.text_edit.setMaximumBlockCount(CONSOLE_MAX_LINES)
+        self.pending = deque(maxlen=CONSOLE_MAX_LINES)
+        self.pending_lock = threading.Lock()
+        self.formats = {}
+        self.timer = QTimer(text_edit)
+        self.timer.timeout.connect(self.flush_pending)
+        self.timer.start(CONSOLE_FLUSH_MS)
     
     def emit(self, record):
         try:
@@ -232,78 +413,78 @@ class ColoredTextEditLogger(logging.Handler):
             elif '🔍' in msg or '📦' in msg or '🔨' in msg:
                 color = '#667EEA'
             
-            formatted = f'<span style="color: {color};">{msg}</span>'
-            self.text_edit.append(formatted)
-            self.text_edit.moveCursor(QTextCursor.MoveOperation.End)
+            with self.pending_lock:
+                self.pending.append((color, msg))
         except:
             pass
+    
+    def char_format(self, color):
+        fmt = self.formats.get(color)
+        if fmt is None:
+            fmt = self.formats[color] = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+        return fmt
+    
+    def flush_pending(self):
+        with self.pending_lock:
+            if not self.pending:
+                return
+            lines = list(self.pending)
+            self.pending.clear()
+        
+        scrollbar = self.text_edit.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for color, msg in lines:
+            if not self.text_edit.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertText(msg, self.char_format(color))
+        cursor.endEditBlock()
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+    
+    def clear(self):
+        with self.pending_lock:
+            self.pending.clear()
+        self.text_edit.clear()
+
 
+# ========== WORKERS ==========
 
-# ========== WORKERS (identiques, version courte) ==========
+# Enveloppes QThread autour de launcher_core : la logique est la même qu'en
+# ligne de commande, seuls les callbacks deviennent des signaux Qt
 
 class UpdateChecker(QThread):
     installation_valid = Signal(bool)
     modpack_unavailable = Signal()
     
     def run(self):
-        try:
-            logging.info("🔍 Vérification de l'installation...")
-            try:
-                resp = requests.get(CONFIG["base_url"] + "modpack.txt", timeout=10)
-                remote_url = resp.text.strip()
-                if remote_url.lower() == "none":
-                    logging.info("⚠️ Le modpack n'est pas encore disponible")
-                    self.modpack_unavailable.emit()
-                    return
-            except Exception as e:
-                logging.warning(f"⚠️ Impossible de vérifier la disponibilité: {e}")
-                self.installation_valid.emit(False)
-                return
-            
-            forge_installed = False
-            try:
-                forge_version = mll.forge.find_forge_version("1.20.1")
-                if forge_version:
-                    versions = mll.utils.get_installed_versions(MINECRAFT_DIR)
-                    installed_forge = mll.forge.forge_to_installed_version(forge_version)
-                    forge_installed = any(v["id"] == installed_forge for v in versions)
-                    if forge_installed:
-                        global INSTALLED_FORGE_VERSION
-                        INSTALLED_FORGE_VERSION = forge_version
-                        logging.info(f"✅ Forge {forge_version} détecté")
-            except Exception as e:
-                logging.warning(f"⚠️ Erreur vérification Forge: {e}")
-            
-            try:
-                resp = requests.get(CONFIG["base_url"] + "modpack.txt", timeout=10)
-                remote_hash = hashlib.md5(resp.text.strip().encode()).hexdigest()
-                local_hash = None
-                if os.path.exists(VERSION_FILE):
-                    try:
-                        with open(VERSION_FILE, 'r') as f:
-                            local_hash = json.load(f).get('modpack_hash')
-                    except:
-                        pass
-                
-                mods_exist = os.path.exists(MODS_DIR) and len(list(Path(MODS_DIR).glob("*.jar"))) > 0
-                
-                if local_hash == remote_hash and mods_exist and forge_installed:
-                    logging.info("✅ Installation à jour !")
-                    self.installation_valid.emit(True)
-                else:
-                    if not mods_exist:
-                        logging.info("⚠️ Aucun mod installé")
-                    elif local_hash != remote_hash:
-                        logging.info("⚠️ Mise à jour disponible")
-                    elif not forge_installed:
-                        logging.info("⚠️ Forge non installé")
-                    self.installation_valid.emit(False)
-            except Exception as e:
-                logging.warning(f"⚠️ Impossible de vérifier la version: {e}")
-                self.installation_valid.emit(False)
-        except Exception as e:
-            logging.error(f"❌ Erreur vérification: {e}")
-            self.installation_valid.emit(False)
+        valid = check_installation()
+        if valid is None:
+            self.modpack_unavailable.emit()
+        else:
+            self.installation_valid.emit(valid)
+
+
+# Vérification sha256 en arrière-plan, en priorité basse et avec de courtes
+# pauses pour ne pas gêner l'interface ni le disque
+class VerifyWorker(QThread):
+    corrupted = Signal(list)
+    log = Signal(str)
+    
+    def __init__(self):
+        super().__init__()
+        self._running = True
+    
+    def run(self):
+        bad = verify_mods(lambda: self._running, self.log.emit, pause=0.005)
+        if bad:
+            self.corrupted.emit(bad)
+    
+    def stop(self):
+        self._running = False
 
 
 class InstallWorker(QThread):
@@ -313,204 +494,180 @@ class InstallWorker(QThread):
     
     def __init__(self):
         super().__init__()
-        self._running = True
+        self.installer = Installer(self.log.emit, self.progress.emit, self.finished.emit)
     
     def run(self):
-        try:
-            self.log.emit("="*70)
-            self.log.emit("📦 TÉLÉCHARGEMENT DES MODS")
-            self.log.emit("="*70)
-            self.progress.emit(5, "Récupération du lien...")
-            self.log.emit("Lecture de modpack.txt...")
-            try:
-                resp = requests.get(CONFIG["base_url"] + "modpack.txt", timeout=15)
-                url = resp.text.strip()
-                if not url:
-                    self.log.emit("❌ modpack.txt est vide")
-                    self.finished.emit(False, "Erreur lien modpack")
-                    return
-                if url.lower() == "none":
-                    self.log.emit("❌ Le modpack n'est pas encore sorti")
-                    self.finished.emit(False, "Modpack pas encore sorti")
-                    return
-                if not url.startswith(('http://', 'https://')):
-                    self.log.emit(f"❌ URL invalide dans modpack.txt: {url}")
-                    self.finished.emit(False, "URL invalide")
-                    return
-                self.log.emit(f"✅ URL récupérée avec succès")
-            except Exception as e:
-                self.log.emit(f"❌ Erreur lors de la lecture de modpack.txt: {e}")
-                self.finished.emit(False, "Erreur URL")
-                return
-            
-            self.progress.emit(10, "Téléchargement...")
-            self.log.emit(f"Téléchargement du modpack...")
-            try:
-                resp = requests.get(url, stream=True, timeout=120)
-                resp.raise_for_status()
-                total_size = int(resp.headers.get('content-length', 0))
-                if total_size > 0:
-                    self.log.emit(f"Taille du fichier: {total_size / (1024*1024):.2f} MB")
-                data = io.BytesIO()
-                downloaded = 0
-                for chunk in resp.iter_content(8192):
-                    if not self._running:
-                        return
-                    if chunk:
-                        data.write(chunk)
-                        downloaded += len(chunk)
-                self.log.emit(f"✅ Téléchargement terminé: {downloaded / (1024*1024):.2f} MB")
-            except Exception as e:
-                self.log.emit(f"❌ Erreur téléchargement: {e}")
-                self.finished.emit(False, "Erreur téléchargement")
-                return
-            
-            self.progress.emit(30, "Extraction...")
-            try:
-                os.makedirs(MODS_DIR, exist_ok=True)
-                old_mods = list(Path(MODS_DIR).glob("*.jar"))
-                if old_mods:
-                    self.log.emit(f"Suppression de {len(old_mods)} ancien(s) mod(s)...")
-                    for mod in old_mods:
-                        try:
-                            mod.unlink()
-                        except:
-                            pass
-                self.log.emit("Extraction du ZIP...")
-                data.seek(0)
-                with zipfile.ZipFile(data) as z:
-                    jars = [f for f in z.namelist() if f.endswith('.jar') and not f.startswith('__MACOSX')]
-                    if not jars:
-                        self.log.emit("❌ Aucun fichier .jar trouvé")
-                        self.finished.emit(False, "Aucun mod")
-                        return
-                    self.log.emit(f"Extraction de {len(jars)} mod(s):")
-                    count = 0
-                    for jar in jars:
-                        try:
-                            name = os.path.basename(jar)
-                            if name:
-                                content = z.read(jar)
-                                with open(os.path.join(MODS_DIR, name), 'wb') as f:
-                                    f.write(content)
-                                self.log.emit(f"  ✓ {name}")
-                                count += 1
-                        except:
-                            pass
-                    self.log.emit(f"\n✅ {count} mod(s) installé(s)")
-            except Exception as e:
-                self.log.emit(f"❌ Erreur extraction: {e}")
-                self.finished.emit(False, "Erreur extraction")
-                return
-            
-            try:
-                hash_val = hashlib.md5(url.encode()).hexdigest()
-                with open(VERSION_FILE, 'w') as f:
-                    json.dump({'modpack_hash': hash_val, 'url': url}, f)
-            except:
-                pass
-            
-            self.progress.emit(50, "Recherche Forge...")
-            self.log.emit("\n🔍 RECHERCHE DE FORGE")
-            try:
-                forge_ver = mll.forge.find_forge_version("1.20.1")
-                if not forge_ver:
-                    self.finished.emit(False, "Forge introuvable")
-                    return
-                self.log.emit(f"✅ Forge: {forge_ver}")
-            except Exception as e:
-                self.finished.emit(False, "Erreur Forge")
-                return
-            
-            try:
-                versions = mll.utils.get_installed_versions(MINECRAFT_DIR)
-                installed = mll.forge.forge_to_installed_version(forge_ver)
-                if any(v["id"] == installed for v in versions):
-                    global INSTALLED_FORGE_VERSION
-                    INSTALLED_FORGE_VERSION = forge_ver
-                    self.log.emit("✅ Forge déjà installé")
-                    self.progress.emit(100, "Terminé !")
-                    self.finished.emit(True, "Prêt")
-                    return
-            except:
-                pass
-            
-            self.progress.emit(60, "Installation Forge...")
-            self.log.emit("\n🔨 INSTALLATION DE FORGE")
-            try:
-                def status_cb(s):
-                    if self._running:
-                        self.log.emit(s)
-                callback = {
-                    "setStatus": status_cb,
-                    "setProgress": lambda p: None,
-                    "setMax": lambda m: None
-                }
-                mll.forge.install_forge_version(forge_ver, MINECRAFT_DIR, callback=callback)
-                INSTALLED_FORGE_VERSION = forge_ver
-                self.log.emit("\n🎉 INSTALLATION TERMINÉE")
-                self.progress.emit(100, "Terminé !")
-                self.finished.emit(True, "Prêt")
-            except Exception as e:
-                self.log.emit(f"❌ Erreur: {e}")
-                self.finished.emit(False, "Erreur Forge")
-        except Exception as e:
-            self.log.emit(f"❌ ERREUR: {e}")
-            self.finished.emit(False, "Erreur")
+        self.installer.run()
     
     def stop(self):
-        self._running = False
+        self.installer.stop()
 
 
+# Ne fait que renommer les cibles dans la corbeille : rend la main tout de
+# suite, la suppression est faite ensuite par TrashCleaner
 class UninstallWorker(QThread):
     finished = Signal(bool, str)
     log = Signal(str)
     
+    def __init__(self, parts):
+        super().__init__()
+        self.parts = parts
+    
     def run(self):
         try:
-            self.log.emit("\n🗑️  DÉSINSTALLATION...")
-            if os.path.exists(MODS_DIR):
-                count = len(list(Path(MODS_DIR).glob("*.jar")))
-                shutil.rmtree(MODS_DIR)
-                os.makedirs(MODS_DIR)
-                self.log.emit(f"✅ {count} mods supprimés")
-            versions_dir = os.path.join(MINECRAFT_DIR, "versions")
-            if os.path.exists(versions_dir):
-                for v in Path(versions_dir).iterdir():
-                    if "forge" in v.name.lower():
-                        shutil.rmtree(v)
-                        self.log.emit(f"✅ {v.name} supprimé")
-            if os.path.exists(VERSION_FILE):
-                os.remove(VERSION_FILE)
-            global INSTALLED_FORGE_VERSION
-            INSTALLED_FORGE_VERSION = None
-            self.log.emit("✅ Terminé")
+            uninstall(self.parts, self.log.emit)
             self.finished.emit(True, "OK")
         except Exception as e:
             self.log.emit(f"❌ Erreur: {e}")
             self.finished.emit(False, str(e))
 
 
+# Vide la corbeille en priorité basse avec de courtes pauses, comme VerifyWorker
+class TrashCleaner(QThread):
+    done = Signal(object)  # octets, peut dépasser 2 Go
+    log = Signal(str)
+    
+    def __init__(self):
+        super().__init__()
+        self._running = True
+    
+    def run(self):
+        self.done.emit(empty_trash(lambda: self._running, self.log.emit, pause=0.005))
+    
+    def stop(self):
+        self._running = False
+
+
+class LaunchPreparer(QThread):
+    ready = Signal(dict)
+    failed = Signal(str)
+    log = Signal(str)
+    
+    def __init__(self, user):
+        super().__init__()
+        self.user = user
+    
+    def run(self):
+        try:
+            self.ready.emit(prepare_launch(self.user, self.log.emit))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+# Résumé de fin de session : parse_gc_pauses relit tout le journal GC, trop
+# long après une grosse session pour le faire dans le thread de l'interface
+class SessionRecorder(QThread):
+    recorded = Signal(dict)
+    
+    def __init__(self, launch, start_time, exit_code, sampler, startup_s):
+        super().__init__()
+        self.args = (launch, start_time, exit_code, sampler, startup_s)
+    
+    def run(self):
+        summary = session_summary(*self.args)
+        record_game_session(summary)
+        self.recorded.emit(summary)
+
+
+# Mise à jour incrémentale de l'index des mods, hors du thread de l'interface
+class ModIndexLoader(QThread):
+    loaded = Signal(dict)
+    log = Signal(str)
+    
+    def run(self):
+        try:
+            self.loaded.emit(update_mod_index(self.log.emit))
+        except Exception as e:
+            self.log.emit(f"⚠️ Index des mods indisponible: {e}")
+
+
+# Icônes des mods : miniature en cache sur disque, sinon logoFile lu dans le
+# jar puis réduit et mis en cache. Se termine dès que la file est vide.
+class IconLoader(QThread):
+    icon_ready = Signal(str, QImage)
+    
+    def __init__(self, requests):
+        super().__init__()
+        self.requests = requests
+        self._running = True
+    
+    def run(self):
+        while self._running:
+            try:
+                jar, entry = self.requests.get_nowait()
+            except queue.Empty:
+                return
+            self.icon_ready.emit(jar, self.load(jar, entry))
+    
+    def load(self, jar, entry):
+        cached = mod_icon_cache_path(jar, entry)
+        if os.path.exists(cached):
+            image = QImage(cached)
+            if not image.isNull():
+                return image
+        data = read_mod_logo(jar, entry)
+        image = QImage.fromData(data) if data else QImage()
+        if image.isNull():
+            return image
+        image = image.scaled(MOD_ICON_SIZE, MOD_ICON_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+                             Qt.TransformationMode.SmoothTransformation)
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            image.save(cached, "PNG")
+        except OSError:
+            pass
+        return image
+    
+    def stop(self):
+        self._running = False
+
+
 # ========== UI PRINCIPALE ==========
 
 class LauncherWindow(QMainWindow):
+    # Émis depuis le thread de sortie du jeu : connexion en file vers l'interface
+    startup_measured = Signal(str)
+    
     def __init__(self):
         super().__init__()
         self.workers = []
         self.minecraft_process = None
+        self.game_output = None
         self.game_running = False
+        self.painted = False
+        self.verify_worker = None
+        self.trash_cleaner = None
         self.init_ui()
+        self.startup_measured.connect(self.on_startup_measured)
+        STARTUP.mark("init_ui")
         self.setup_logging()
         self.startup_animation()
         QTimer.singleShot(800, self.check_installation)
+        # Corbeille d'une désinstallation interrompue : reprise après le démarrage
+        if trash_pending():
+            QTimer.singleShot(3000, self.start_trash_cleaner)
         
         # Timer pour mettre à jour les stats
         self.stats_timer = QTimer()
         self.stats_timer.timeout.connect(self.update_stats)
         self.stats_timer.start(1000)
+        
+        QApplication.instance().aboutToQuit.connect(self.stop_workers)
+    
+    # Un QThread détruit en cours d'exécution fait planter le processus : on
+    # arrête ceux qui savent s'arrêter et on attend la fin de tous. La
+    # corbeille non vidée est reprise au prochain démarrage.
+    def stop_workers(self):
+        for worker in self.workers:
+            if hasattr(worker, "stop"):
+                worker.stop()
+        self.mods_model.stop()
+        for worker in self.workers:
+            worker.wait()
     
     def setup_logging(self):
         handler = ColoredTextEditLogger(self.console)
+        self.console_handler = handler
         handler.setFormatter(logging.Formatter('%(message)s'))
         logging.root.addHandler(handler)
         logging.root.setLevel(logging.INFO)
@@ -588,6 +745,7 @@ class LauncherWindow(QMainWindow):
         
         self.stack.addWidget(self.create_launcher_page())
         self.stack.addWidget(self.create_options_page())
+        self.stack.addWidget(self.create_mods_page())
         self.stack.addWidget(self.create_stats_page())
         self.stack.addWidget(self.create_console_page())
         
@@ -701,6 +859,11 @@ class LauncherWindow(QMainWindow):
         """)
         layout.addWidget(self.launch_btn)
         
+        self.last_start_label = QLabel(last_launch_text())
+        self.last_start_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.last_start_label.setStyleSheet("color: #6C757D; font-size: 10px;")
+        layout.addWidget(self.last_start_label)
+        
         layout.addStretch()
         
         return page
@@ -752,7 +915,7 @@ class LauncherWindow(QMainWindow):
         minus_layout.addWidget(self.minus_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         ram_container.addWidget(minus_container)
         
-        self.ram_display = QLabel(f"{CONFIG['ram_gb']} Go")
+        self.ram_display = QLabel("Auto" if CONFIG["ram_auto"] else f"{CONFIG['ram_gb']} Go")
         self.ram_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.ram_display.setFixedHeight(50)
         self.ram_display.setStyleSheet("""
@@ -801,9 +964,80 @@ class LauncherWindow(QMainWindow):
         
         layout.addLayout(ram_container)
         
-        ram_hint = QLabel("Recommandé: 4-8 Go")
-        ram_hint.setStyleSheet("color: #6C757D; font-size: 10px;")
-        layout.addWidget(ram_hint)
+        self.ram_auto_switch = ModernCheckBox("Automatique (selon la machine et le modpack)")
+        self.ram_auto_switch.setChecked(CONFIG["ram_auto"])
+        self.ram_auto_switch.stateChanged.connect(self.toggle_ram_auto)
+        layout.addWidget(self.ram_auto_switch)
+        
+        self.ram_hint = QLabel("Recommandé: 4-8 Go")
+        self.ram_hint.setWordWrap(True)
+        self.ram_hint.setStyleSheet("color: #6C757D; font-size: 10px;")
+        layout.addWidget(self.ram_hint)
+        
+        layout.addSpacing(12)
+        
+        # Profil JVM
+        jvm_label = QLabel("☕ Profil JVM")
+        jvm_label.setStyleSheet("color: #495057; font-weight: 600; font-size: 12px;")
+        layout.addWidget(jvm_label)
+        
+        profiles_row = QHBoxLayout()
+        profiles_row.setSpacing(8)
+        self.jvm_buttons = {}
+        for name, (label, _, min_java) in JVM_PROFILES.items():
+            btn = QPushButton(label + (f" (Java {min_java}+)" if min_java else ""))
+            btn.setCheckable(True)
+            btn.setFixedHeight(34)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.setStyleSheet("""
+                QPushButton {
+                    background: #FFFFFF;
+                    color: #495057;
+                    border: 2px solid #E9ECEF;
+                    border-radius: 8px;
+                    font-size: 11px;
+                    font-weight: 600;
+                    padding: 0 10px;
+                }
+                QPushButton:checked {
+                    background: #667EEA;
+                    color: white;
+                    border: 2px solid #667EEA;
+                }
+                QPushButton:hover:!checked {
+                    border: 2px solid #667EEA;
+                }
+            """)
+            btn.clicked.connect(lambda checked, n=name: self.select_jvm_profile(n))
+            profiles_row.addWidget(btn)
+            self.jvm_buttons[name] = btn
+        layout.addLayout(profiles_row)
+        
+        self.jvm_custom_input = QLineEdit(CONFIG["jvm_custom_args"])
+        self.jvm_custom_input.setPlaceholderText("-XX:+UseG1GC -XX:MaxGCPauseMillis=50 ...")
+        self.jvm_custom_input.setFixedHeight(36)
+        self.jvm_custom_input.setStyleSheet("""
+            QLineEdit {
+                background: #FFFFFF;
+                border: 2px solid #E9ECEF;
+                border-radius: 8px;
+                padding: 0 10px;
+                font-family: Consolas, monospace;
+                font-size: 11px;
+                color: #212529;
+            }
+            QLineEdit:focus {
+                border: 2px solid #667EEA;
+            }
+        """)
+        self.jvm_custom_input.textChanged.connect(lambda text: CONFIG.__setitem__("jvm_custom_args", text))
+        layout.addWidget(self.jvm_custom_input)
+        
+        self.jvm_stats_label = QLabel("")
+        self.jvm_stats_label.setWordWrap(True)
+        self.jvm_stats_label.setStyleSheet("color: #6C757D; font-size: 10px;")
+        layout.addWidget(self.jvm_stats_label)
+        self.select_jvm_profile(CONFIG["jvm_profile"])
         
         layout.addSpacing(12)
         
@@ -835,7 +1069,11 @@ class LauncherWindow(QMainWindow):
         actions_grid.addWidget(copy_logs_btn, 0, 1)
         
         discord_btn = self.create_action_button("💬 Rejoindre Discord", self.open_discord)
-        actions_grid.addWidget(discord_btn, 1, 0, 1, 2)
+        actions_grid.addWidget(discord_btn, 1, 0)
+        
+        self.rollback_btn = self.create_action_button("↩️ Version précédente", self.rollback)
+        self.rollback_btn.setEnabled(can_rollback())
+        actions_grid.addWidget(self.rollback_btn, 1, 1)
         
         layout.addLayout(actions_grid)
         
@@ -846,7 +1084,15 @@ class LauncherWindow(QMainWindow):
         uninstall_label.setStyleSheet("color: #495057; font-weight: 600; font-size: 12px;")
         layout.addWidget(uninstall_label)
         
-        self.uninstall_btn = QPushButton("Désinstaller Forge et mods")
+        self.uninstall_parts = {}
+        for part, text in (("mods", "Mods"), ("forge", "Forge"), ("caches", "Caches du launcher")):
+            switch = ModernCheckBox(text)
+            switch.setChecked(part != "caches")
+            switch.stateChanged.connect(lambda _: self.update_uninstall_button())
+            layout.addWidget(switch)
+            self.uninstall_parts[part] = switch
+        
+        self.uninstall_btn = QPushButton("Désinstaller la sélection")
         self.uninstall_btn.setFixedHeight(42)
         self.uninstall_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
         self.uninstall_btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -864,7 +1110,7 @@ class LauncherWindow(QMainWindow):
         """)
         layout.addWidget(self.uninstall_btn)
         
-        hint = QLabel("⚠️ Supprime tout Forge et les mods")
+        hint = QLabel("⚠️ La suppression continue en arrière-plan, même après un redémarrage")
         hint.setStyleSheet("color: #DC3545; font-size: 9px;")
         layout.addWidget(hint)
         
@@ -872,8 +1118,108 @@ class LauncherWindow(QMainWindow):
         
         QTimer.singleShot(0, self.update_ram_buttons)
         
+        # Défilement : la page dépasse la hauteur de la fenêtre
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setStyleSheet("QScrollArea { background: #F8F9FA; }")
+        scroll.setWidget(page)
+        return scroll
+    
+    # Liste virtualisée : la vue ne crée aucun widget par mod
+    def create_mods_page(self):
+        page = QWidget()
+        page.setStyleSheet("background: #F8F9FA;")
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(45, 25, 45, 25)
+        layout.setSpacing(12)
+        
+        header = QHBoxLayout()
+        self.mods_search = QLineEdit()
+        self.mods_search.setPlaceholderText("🔍 Rechercher un mod (nom, id, fichier)")
+        self.mods_search.setFixedHeight(40)
+        self.mods_search.setStyleSheet("""
+            QLineEdit {
+                background: #FFFFFF;
+                border: 2px solid #E9ECEF;
+                border-radius: 10px;
+                padding: 0 14px;
+                font-size: 12px;
+                color: #212529;
+            }
+            QLineEdit:focus {
+                border: 2px solid #667EEA;
+            }
+        """)
+        header.addWidget(self.mods_search)
+        
+        self.mods_count = QLabel("")
+        self.mods_count.setStyleSheet("color: #6C757D; font-size: 11px; font-weight: 600;")
+        header.addWidget(self.mods_count)
+        layout.addLayout(header)
+        
+        self.mods_model = ModListModel(self)
+        self.mods_view = QListView()
+        self.mods_view.setModel(self.mods_model)
+        self.mods_view.setUniformItemSizes(True)
+        self.mods_view.setIconSize(QSize(MOD_ICON_SIZE, MOD_ICON_SIZE))
+        self.mods_view.setSpacing(2)
+        self.mods_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.mods_view.setStyleSheet("""
+            QListView {
+                background: #FFFFFF;
+                border: 2px solid #E9ECEF;
+                border-radius: 10px;
+                padding: 6px;
+                font-size: 11px;
+                color: #212529;
+            }
+            QListView::item {
+                padding: 4px;
+                border-radius: 6px;
+            }
+            QListView::item:hover {
+                background: rgba(102, 126, 234, 0.08);
+            }
+        """)
+        layout.addWidget(self.mods_view)
+        
+        # Recherche appliquée après une courte pause de frappe
+        self.mods_filter_timer = QTimer()
+        self.mods_filter_timer.setSingleShot(True)
+        self.mods_filter_timer.setInterval(120)
+        self.mods_filter_timer.timeout.connect(self.apply_mods_filter)
+        self.mods_search.textChanged.connect(lambda _: self.mods_filter_timer.start())
+        
+        self.mods_loader = None
+        
         return page
     
+    def refresh_mods(self):
+        if self.mods_loader is not None and self.mods_loader.isRunning():
+            return
+        if not self.mods_model.rows:
+            self.mods_count.setText("Chargement...")
+        self.mods_loader = ModIndexLoader()
+        self.mods_loader.loaded.connect(self.on_mods_loaded)
+        self.mods_loader.log.connect(logging.info)
+        self.mods_loader.start()
+        self.workers.append(self.mods_loader)
+    
+    def on_mods_loaded(self, index):
+        self.mods_model.set_index(index)
+        self.update_mods_count()
+    
+    def apply_mods_filter(self):
+        self.mods_model.set_filter(self.mods_search.text())
+        self.mods_view.scrollToTop()
+        self.update_mods_count()
+    
+    def update_mods_count(self):
+        total = len(self.mods_model.rows)
+        shown = len(self.mods_model.visible)
+        self.mods_count.setText(f"{shown} / {total} mods" if shown != total else f"{total} mods")
+    
     def create_stats_page(self):
         page = QWidget()
         page.setStyleSheet("background: #F8F9FA;")
@@ -899,25 +1245,37 @@ class LauncherWindow(QMainWindow):
         stats_layout = QVBoxLayout(self.stats_container)
         stats_layout.setSpacing(15)
         
-        self.cpu_card = self.create_stat_card("🔥 CPU", "0%", "#667EEA")
+        self.playtime_card = self.create_stat_card("⏱️ Temps de jeu", "00:00:00", "#764BA2")
+        stats_layout.addWidget(self.playtime_card)
+        
+        self.cpu_card = self.create_chart_card("🔥 CPU", "#667EEA")
         stats_layout.addWidget(self.cpu_card)
         
-        self.ram_card = self.create_stat_card("💾 RAM du jeu", "0 MB", "#11998E")
+        self.ram_card = self.create_chart_card("💾 RAM du jeu", "#11998E")
         stats_layout.addWidget(self.ram_card)
         
-        self.system_ram_card = self.create_stat_card("🖥️ RAM Système", f"{psutil.virtual_memory().percent}%", "#FF9500")
+        self.system_ram_card = self.create_chart_card("🖥️ RAM Système", "#FF9500")
         stats_layout.addWidget(self.system_ram_card)
         
-        self.playtime_card = self.create_stat_card("⏱️ Temps de jeu", "00:00:00", "#764BA2")
-        stats_layout.addWidget(self.playtime_card)
+        self.threads_card = self.create_chart_card("🧵 Threads", "#E83E8C")
+        stats_layout.addWidget(self.threads_card)
+        
+        self.io_card = self.create_chart_card("💽 Disque (lecture + écriture)", "#17A2B8")
+        stats_layout.addWidget(self.io_card)
         
         stats_layout.addStretch()
-        self.stats_container.hide()
         
-        layout.addWidget(self.stats_container)
-        layout.addStretch()
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setWidget(self.stats_container)
+        scroll.hide()
+        self.stats_scroll = scroll
+        
+        layout.addWidget(scroll)
         
         self.start_time = None
+        self.stats_sampler = None
         
         return page
     
@@ -953,36 +1311,86 @@ class LauncherWindow(QMainWindow):
         
         return card
     
+    # Carte avec courbe : valeur actuelle, historique, pic et moyenne de session
+    def create_chart_card(self, title, color):
+        card = QFrame()
+        card.setFixedHeight(118)
+        card.setStyleSheet(f"""
+            QFrame {{
+                background: #FFFFFF;
+                border-left: 4px solid {color};
+                border-radius: 10px;
+            }}
+        """)
+        
+        card_layout = QVBoxLayout(card)
+        card_layout.setContentsMargins(24, 10, 24, 10)
+        card_layout.setSpacing(4)
+        
+        header = QHBoxLayout()
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        title_label.setStyleSheet("color: #6C757D; border: none;")
+        header.addWidget(title_label)
+        header.addStretch()
+        
+        value_label = QLabel("-")
+        value_label.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
+        value_label.setStyleSheet(f"color: {color}; border: none;")
+        header.addWidget(value_label)
+        card_layout.addLayout(header)
+        
+        chart = Sparkline(color)
+        chart.setStyleSheet("border: none;")
+        card_layout.addWidget(chart)
+        
+        summary_label = QLabel("")
+        summary_label.setStyleSheet("color: #ADB5BD; font-size: 10px; border: none;")
+        card_layout.addWidget(summary_label)
+        
+        card.value_label = value_label
+        card.chart = chart
+        card.summary_label = summary_label
+        
+        return card
+    
+    def set_chart(self, card, values, last, peak, average, fmt):
+        card.value_label.setText(fmt(last))
+        card.summary_label.setText(f"pic {fmt(peak)}  •  moyenne {fmt(average)}")
+        card.chart.set_values(values, peak)
+    
+    # Ne fait que lire l'instantané du StatsSampler : aucun appel psutil ici.
+    # Les courbes de la dernière session restent affichées après la fermeture.
     def update_stats(self):
-        if not self.game_running or not self.minecraft_process:
+        if self.stats_sampler is None:
             self.stats_not_running.show()
-            self.stats_container.hide()
+            self.stats_scroll.hide()
             return
         
         self.stats_not_running.hide()
-        self.stats_container.show()
+        self.stats_scroll.show()
         
-        try:
-            mc_pid = self.minecraft_process.processId()
-            if mc_pid:
-                process = psutil.Process(mc_pid)
-                
-                cpu_percent = process.cpu_percent(interval=0.1)
-                self.cpu_card.value_label.setText(f"{cpu_percent:.1f}%")
-                
-                ram_mb = process.memory_info().rss / (1024 * 1024)
-                self.ram_card.value_label.setText(f"{ram_mb:.0f} MB")
-                
-                system_ram = psutil.virtual_memory().percent
-                self.system_ram_card.value_label.setText(f"{system_ram:.1f}%")
-                
-                if self.start_time:
-                    elapsed = datetime.now() - self.start_time
-                    hours, remainder = divmod(int(elapsed.total_seconds()), 3600)
-                    minutes, seconds = divmod(remainder, 60)
-                    self.playtime_card.value_label.setText(f"{hours:02d}:{minutes:02d}:{seconds:02d}")
-        except:
-            pass
+        if not self.stats_scroll.isVisible():
+            return
+        
+        series = self.stats_sampler.snapshot()
+        self.set_chart(self.cpu_card, *series["cpu"], lambda v: f"{v:.1f}%")
+        self.set_chart(self.ram_card, *series["rss_mb"], lambda v: f"{v:.0f} MB")
+        self.set_chart(self.system_ram_card, *series["system_ram"], lambda v: f"{v:.1f}%")
+        self.set_chart(self.threads_card, *series["threads"], lambda v: f"{v:.0f}")
+        self.threads_card.value_label.setText(
+            f"{series['threads'][1]:.0f} • {series['processes'][1]:.0f} processus")
+        self.ram_card.summary_label.setText(
+            f"{self.ram_card.summary_label.text()}  •  USS {series['uss_mb'][1]:.0f} MB  •  "
+            f"{series['open_files'][1]:.0f} fichiers ouverts")
+        self.set_chart(self.io_card, *series["io_mbs"], lambda v: f"{v:.1f} Mo/s")
+        self.io_card.value_label.setText(f"↓ {series['read_mbs'][1]:.1f}  ↑ {series['write_mbs'][1]:.1f} Mo/s")
+        
+        if self.start_time:
+            elapsed = datetime.now() - self.start_time
+            hours, remainder = divmod(int(elapsed.total_seconds()), 3600)
+            minutes, seconds = divmod(remainder, 60)
+            self.playtime_card.value_label.setText(f"{hours:02d}:{minutes:02d}:{seconds:02d}")
     
     def create_action_button(self, text, callback):
         btn = QPushButton(text)
@@ -1003,11 +1411,14 @@ class LauncherWindow(QMainWindow):
                 border-radius: 8px;
                 text-align: center;
             }
-            QPushButton:hover {
+            QPushButton:hover:enabled {
                 background: #667EEA;
                 color: white;
                 border: 2px solid #667EEA;
             }
+            QPushButton:disabled {
+                color: #CED4DA;
+            }
         """)
         return btn
     
@@ -1039,10 +1450,11 @@ class LauncherWindow(QMainWindow):
         layout = QVBoxLayout(page)
         layout.setContentsMargins(15, 15, 15, 15)
         
-        self.console = QTextEdit()
+        self.console = QPlainTextEdit()
         self.console.setReadOnly(True)
+        self.console.setUndoRedoEnabled(False)
         self.console.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background: #1E1E1E;
                 color: #0DBC79;
                 border: 2px solid #E9ECEF;
@@ -1086,6 +1498,38 @@ class LauncherWindow(QMainWindow):
     
     def switch_page(self, index):
         self.stack.setCurrentIndex(index)
+        if index == 1:
+            self.refresh_ram_recommendation()
+            stats = jvm_profile_stats()
+            self.jvm_stats_label.setText("\n".join(stats) if stats else "Aucune session enregistrée pour comparer les profils")
+        elif index == 2:
+            self.refresh_mods()
+    
+    def select_jvm_profile(self, name):
+        CONFIG["jvm_profile"] = name
+        for profile, btn in self.jvm_buttons.items():
+            btn.setChecked(profile == name)
+        self.jvm_custom_input.setVisible(name == "custom")
+    
+    def toggle_ram_auto(self, state):
+        CONFIG["ram_auto"] = state == 2
+        self.refresh_ram_recommendation()
+    
+    # Calculé à l'ouverture des options (psutil n'est pas chargé au démarrage)
+    def refresh_ram_recommendation(self):
+        if not CONFIG["ram_auto"]:
+            self.ram_display.setText(f"{CONFIG['ram_gb']} Go")
+            self.ram_hint.setText("Recommandé: 4-8 Go")
+            self.update_ram_buttons()
+            return
+        try:
+            xmx, xms, reasons = recommend_heap()
+        except Exception as e:
+            self.ram_hint.setText(f"Calcul automatique impossible: {e}")
+            return
+        self.ram_display.setText(f"{xmx / 1024:g} Go (auto)")
+        self.ram_hint.setText("\n".join(reasons))
+        self.update_ram_buttons()
     
     def decrease_ram(self):
         if CONFIG["ram_gb"] > 2:
@@ -1115,31 +1559,74 @@ class LauncherWindow(QMainWindow):
         anim.start()
     
     def update_ram_buttons(self):
-        self.minus_btn.setEnabled(CONFIG["ram_gb"] > 2)
-        self.plus_btn.setEnabled(CONFIG["ram_gb"] < 16)
+        self.minus_btn.setEnabled(not CONFIG["ram_auto"] and CONFIG["ram_gb"] > 2)
+        self.plus_btn.setEnabled(not CONFIG["ram_auto"] and CONFIG["ram_gb"] < 16)
     
     def check_installation(self):
+        self.stop_verification()
         worker = UpdateChecker()
         worker.installation_valid.connect(self.on_check)
         worker.modpack_unavailable.connect(lambda: self.on_check(False))
         worker.start()
         self.workers.append(worker)
     
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.painted:
+            self.painted = True
+            STARTUP.mark("first_paint")
+    
     def on_check(self, valid):
+        STARTUP.mark("first_check")
+        STARTUP.report()
         if valid:
             self.status.setText("✅ Prêt à jouer !")
             self.status.setStyleSheet("color: #11998E; font-weight: 600; font-size: 12px;")
             self.launch_btn.setEnabled(True)
-            self.install_btn.setText("✅ À jour")
+            if mods_pinned():
+                # Version précédente gardée volontairement : Installer la remet à jour
+                self.install_btn.setText("📦 Mettre à jour")
+                self.install_btn.setEnabled(True)
+            else:
+                self.install_btn.setText("✅ À jour")
+            QTimer.singleShot(3000, self.start_verification)
         else:
             self.status.setText("Installation requise")
             self.status.setStyleSheet("color: #FF9500; font-weight: 600; font-size: 12px;")
             self.install_btn.setEnabled(True)
     
+    def start_verification(self):
+        if self.game_running or self.verify_worker is not None:
+            return
+        worker = VerifyWorker()
+        worker.corrupted.connect(self.on_corrupted)
+        worker.log.connect(lambda msg: logging.info(msg))
+        worker.finished.connect(lambda: setattr(self, 'verify_worker', None))
+        worker.start(QThread.Priority.LowestPriority)
+        self.verify_worker = worker
+        self.workers.append(worker)
+    
+    def stop_verification(self):
+        if self.verify_worker is not None:
+            self.verify_worker.stop()
+            self.verify_worker.wait()
+            self.verify_worker = None
+    
+    def on_corrupted(self, names):
+        logging.warning(f"⚠️ {len(names)} mod(s) corrompu(s): {', '.join(names[:5])}")
+        if self.game_running:
+            return
+        self.status.setText(f"⚠️ {len(names)} mod(s) corrompu(s)")
+        self.status.setStyleSheet("color: #FF9500; font-weight: 600; font-size: 12px;")
+        self.launch_btn.setEnabled(False)
+        self.install_btn.setText("🔧 Réparer")
+        self.install_btn.setEnabled(True)
+    
     def install(self):
+        self.stop_verification()
         self.install_btn.setEnabled(False)
         self.status.setText("Installation...")
-        self.console.clear()
+        self.console_handler.clear()
         
         worker = InstallWorker()
         worker.progress.connect(self.on_progress)
@@ -1148,11 +1635,25 @@ class LauncherWindow(QMainWindow):
         worker.start()
         self.workers.append(worker)
     
+    def rollback(self):
+        if self.game_running or not can_rollback():
+            return
+        try:
+            rollback_mods()
+            logging.info("↩️ Version précédente des mods restaurée")
+        except OSError as e:
+            logging.error(f"❌ Retour arrière impossible: {e}")
+            return
+        self.launch_btn.setEnabled(False)
+        self.status.setText("Vérification...")
+        self.check_installation()
+    
     def on_progress(self, val, text):
         self.progress.setValue(val)
         self.status.setText(text)
     
     def on_install_done(self, success, msg):
+        self.rollback_btn.setEnabled(can_rollback())
         if success:
             self.status.setText("✨ Prêt !")
             self.status.setStyleSheet("color: #11998E; font-weight: 600; font-size: 12px;")
@@ -1167,55 +1668,91 @@ class LauncherWindow(QMainWindow):
                 self.status.setStyleSheet("color: #DC3545; font-weight: 600; font-size: 12px;")
                 self.install_btn.setEnabled(True)
     
+    def update_uninstall_button(self):
+        self.uninstall_btn.setEnabled(any(switch.isChecked() for switch in self.uninstall_parts.values()))
+    
     def uninstall(self):
+        parts = [part for part, switch in self.uninstall_parts.items() if switch.isChecked()]
+        if not parts:
+            return
+        self.stop_verification()
         self.uninstall_btn.setEnabled(False)
-        worker = UninstallWorker()
-        worker.finished.connect(self.on_uninstall_done)
+        worker = UninstallWorker(parts)
+        worker.finished.connect(lambda success, msg: self.on_uninstall_done(success, msg, parts))
         worker.log.connect(lambda msg: logging.info(msg))
         worker.start()
         self.workers.append(worker)
     
-    def on_uninstall_done(self, success, msg):
-        self.uninstall_btn.setEnabled(True)
-        if success:
+    def on_uninstall_done(self, success, msg, parts):
+        self.update_uninstall_button()
+        self.rollback_btn.setEnabled(can_rollback())
+        self.start_trash_cleaner()
+        if success and ("mods" in parts or "forge" in parts):
             self.launch_btn.setEnabled(False)
             self.install_btn.setEnabled(True)
             self.install_btn.setText("📦 Installer les mods")
             self.status.setText("Installation requise")
     
+    def start_trash_cleaner(self):
+        if self.trash_cleaner is not None and self.trash_cleaner.isRunning():
+            return
+        self.trash_cleaner = TrashCleaner()
+        self.trash_cleaner.done.connect(self.on_trash_emptied)
+        self.trash_cleaner.log.connect(logging.warning)
+        self.trash_cleaner.start(QThread.Priority.LowestPriority)
+        self.workers.append(self.trash_cleaner)
+    
+    def on_trash_emptied(self, freed):
+        if freed:
+            logging.info(f"♻️ {format_bytes(freed)} libérés")
+    
     def launch(self):
         user = self.username.text().strip()
         if not user:
             self.status.setText("⚠️ Pseudo requis")
             return
         
-        if not INSTALLED_FORGE_VERSION:
+        if not core.INSTALLED_FORGE_VERSION:
             return
         
+        self.stop_verification()
         self.launch_btn.setEnabled(False)
         logging.info("\n🚀 LANCEMENT DE MINECRAFT")
         
+        logging.info(f"Utilisateur: {user}")
+        
+        worker = LaunchPreparer(user)
+        worker.log.connect(lambda msg: logging.info(msg))
+        worker.ready.connect(self.start_game)
+        worker.failed.connect(self.on_launch_failed)
+        worker.start()
+        self.workers.append(worker)
+    
+    def on_launch_failed(self, error):
+        logging.error(f"❌ Erreur: {error}")
+        self.launch_btn.setEnabled(True)
+    
+    def start_game(self, launch):
         try:
-            ver = mll.forge.forge_to_installed_version(INSTALLED_FORGE_VERSION)
-            ram = CONFIG["ram_gb"]
+            cmd, output = launch['cmd'], launch['output']
+            self.current_launch = launch
             
-            logging.info(f"Utilisateur: {user}")
-            logging.info(f"RAM: {ram} Go\n")
-            
-            opts = {
-                "username": user,
-                "uuid": "",
-                "token": "",
-                "jvmArguments": [f"-Xmx{ram}G", f"-Xms{ram//2}G"],
-            }
+            output.start()
+            self.game_output = output
+            logging.info(f"📝 Journal de session: {output.log_path}")
             
-            cmd = mll.command.get_minecraft_command(ver, MINECRAFT_DIR, opts)
-            
-            self.minecraft_process = QProcess(self)
-            self.minecraft_process.readyReadStandardOutput.connect(
-                lambda: logging.info(bytes(self.minecraft_process.readAllStandardOutput()).decode('utf-8', errors='ignore'))
+            process = QProcess(self)
+            process.readyReadStandardOutput.connect(
+                lambda: output.feed('out', bytes(process.readAllStandardOutput()))
+            )
+            process.readyReadStandardError.connect(
+                lambda: output.feed('err', bytes(process.readAllStandardError()))
             )
+            process.started.connect(lambda: self.start_stats_sampler(process.processId()))
+            self.minecraft_process = process
             self.minecraft_process.finished.connect(self.on_mc_finished)
+            self.launch_timer = LaunchTimer(launch['context'], on_complete=self.startup_measured.emit)
+            output.listeners.append(self.launch_timer)
             self.minecraft_process.start(cmd[0], cmd[1:])
             
             self.game_running = True
@@ -1228,7 +1765,31 @@ class LauncherWindow(QMainWindow):
             logging.error(f"❌ Erreur: {e}")
             self.launch_btn.setEnabled(True)
     
+    def on_startup_measured(self, text):
+        self.last_start_label.setText(text)
+        logging.info(f"🏁 {text}")
+    
+    def start_stats_sampler(self, pid):
+        if self.stats_sampler is not None:
+            self.stats_sampler.stop()
+        self.stats_sampler = StatsSampler(pid)
+        self.stats_sampler.start()
+    
     def on_mc_finished(self, exit_code, exit_status):
+        if self.stats_sampler is not None:
+            self.stats_sampler.stop()
+            worker = SessionRecorder(self.current_launch, self.start_time, exit_code, self.stats_sampler,
+                                     self.launch_timer.startup_s)
+            worker.recorded.connect(lambda summary: logging.info(
+                f"📈 Session: {summary['duration_s'] // 60} min, pic RAM {summary['peak_rss_mb']} MB, "
+                f"CPU moyen {summary['avg_cpu']}%"))
+            worker.start()
+            self.workers.append(worker)
+        if self.game_output is not None:
+            self.game_output.feed('out', bytes(self.minecraft_process.readAllStandardOutput()))
+            self.game_output.feed('err', bytes(self.minecraft_process.readAllStandardError()))
+            self.game_output.close()
+            self.game_output = None
         logging.info(f"\n🛑 Minecraft fermé")
         self.status.setText("Prêt")
         self.launch_btn.setEnabled(True)
@@ -1240,10 +1801,13 @@ class LauncherWindow(QMainWindow):
 
 
 def main():
+    STARTUP.mark("imports")
     app = QApplication(sys.argv)
     app.setApplicationName("LoannSMP Launcher")
+    STARTUP.mark("QApplication")
     window = LauncherWindow()
     window.show()
+    STARTUP.mark("show")
     sys.exit(app.exec())
 
 if __name__ == "__main__":
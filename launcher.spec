@@ -16,8 +16,10 @@ a = Analysis(
         'PySide6.QtWidgets',
         
         # Autres dépendances spécifiques utilisées dans launcher.py
+        # Chargés à la demande (importlib) : invisibles pour l'analyse statique
         'minecraft_launcher_lib',
         'requests',
+        'psutil',
         'packaging',
         'packaging.version',
         'packaging.specifiers',
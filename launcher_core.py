@@ -0,0 +1,2737 @@
+# Cœur du launcher, sans Qt : installation, vérification, lancement et mesures.
+# launcher.py (interface PySide6) et la ligne de commande (--install, --check,
+# --verify, --launch) s'appuient tous les deux sur ce module.
+import time
+_STARTUP_T0 = time.perf_counter()
+import sys
+import os
+import importlib
+import shutil
+from pathlib import Path
+import logging
+from datetime import datetime
+import hashlib
+import json
+import threading
+import queue
+import codecs
+import re
+import logging.handlers
+import shlex
+import subprocess
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ========== DÉMARRAGE ==========
+
+# LOANNSMP_PROFILE=1 (ou --profile) affiche le temps passé dans chaque phase
+# du démarrage et l'ajoute à loannsmp_cache/startup.jsonl pour comparer les
+# versions du launcher entre elles
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = os.environ.get("LOANNSMP_PROFILE") == "1" or "--profile" in sys.argv
+        self.marks = []
+        self.imports = {}
+        self.last = _STARTUP_T0
+        self.reported = False
+    
+    def mark(self, phase):
+        if any(name == phase for name, _, _ in self.marks):
+            return
+        now = time.perf_counter()
+        self.marks.append((phase, now - self.last, now - _STARTUP_T0))
+        self.last = now
+    
+    def report(self):
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        lines = ["⏱️ Démarrage:"]
+        for phase, delta, total in self.marks:
+            lines.append(f"  {phase:<14} +{delta * 1000:7.1f} ms   (t={total * 1000:7.1f} ms)")
+        for name, elapsed in self.imports.items():
+            lines.append(f"  import {name:<20} {elapsed * 1000:7.1f} ms")
+        for line in lines:
+            logging.info(line)
+            if sys.stderr:
+                print(line, file=sys.stderr)
+        try:
+            os.makedirs(os.path.join(MINECRAFT_DIR, "loannsmp_cache"), exist_ok=True)
+            with open(os.path.join(MINECRAFT_DIR, "loannsmp_cache", "startup.jsonl"), 'a') as f:
+                f.write(json.dumps({
+                    'date': datetime.now().isoformat(timespec='seconds'),
+                    'phases_ms': {phase: round(total * 1000, 1) for phase, _, total in self.marks},
+                    'imports_ms': {name: round(elapsed * 1000, 1) for name, elapsed in self.imports.items()},
+                }) + "\n")
+        except OSError:
+            pass
+
+
+STARTUP = StartupProfiler()
+
+
+# Les modules lourds (réseau, minecraft_launcher_lib, psutil) ne sont chargés
+# qu'à leur première utilisation, en général depuis un thread de travail
+class LazyModule:
+    _lock = threading.Lock()
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            with LazyModule._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    STARTUP.imports[self._name] = time.perf_counter() - start
+                    self._module = module
+        return getattr(self._module, attr)
+
+
+requests = LazyModule("requests")
+mll = LazyModule("minecraft_launcher_lib")
+psutil = LazyModule("psutil")
+
+
+# Même logique que mll.utils.get_minecraft_directory(), sans importer la lib
+def default_minecraft_directory():
+    if sys.platform.startswith("win"):
+        return os.path.join(os.getenv("APPDATA", os.path.join(Path.home(), "AppData", "Roaming")), ".minecraft")
+    elif sys.platform == "darwin":
+        return os.path.join(str(Path.home()), "Library", "Application Support", "minecraft")
+    return os.path.join(str(Path.home()), ".minecraft")
+
+
+# ========== CONFIG ==========
+CONFIG = {
+    "base_url": "https://raw.githubusercontent.com/NotLoann/loannsmp-modpack/main/",
+    "ram_gb": 4,
+    "ram_auto": True,  # -Xmx/-Xms calculés par recommend_heap() au lancement
+    "jvm_profile": "g1",  # voir JVM_PROFILES
+    "jvm_custom_args": "",
+    "keep_launcher_open": True, # ACTIVÉ PAR DÉFAUT
+    "discord_url": "https://discord.gg/x3GtCqqXXj",
+    "extract_workers": min(8, os.cpu_count() or 4),  # 1 = extraction en série
+    "jar_cache_max_mb": 4096,
+    "forge_cache_ttl_h": 24,
+    "prefetch_game_files": True,  # False = installation Forge entièrement par minecraft_launcher_lib
+    "download_workers": 16,
+    "mod_index_workers": 4,  # lecture des mods.toml pour l'index des mods
+    "game_log_max_mb": 20,  # par fichier, 3 fichiers de rotation par session
+    "game_log_sessions": 10,  # nombre de sessions gardées dans loannsmp_logs
+}
+
+MINECRAFT_DIR = default_minecraft_directory()
+MODS_DIR = os.path.join(MINECRAFT_DIR, "mods")
+VERSION_FILE = os.path.join(MINECRAFT_DIR, "loannsmp_version.json")
+STAGING_DIR = os.path.join(MINECRAFT_DIR, "loannsmp_mods_staging")
+PREVIOUS_MODS_DIR = os.path.join(MINECRAFT_DIR, "loannsmp_mods_previous")
+PREVIOUS_VERSION_FILE = os.path.join(MINECRAFT_DIR, "loannsmp_version.previous.json")
+LAUNCH_COMMAND_CACHE_FILE = os.path.join(MINECRAFT_DIR, "loannsmp_cache", "launch_command.json")
+JAVA_CACHE_FILE = os.path.join(MINECRAFT_DIR, "loannsmp_cache", "java.json")
+JAR_CACHE_DIR = os.path.join(MINECRAFT_DIR, "loannsmp_cache", "jars")
+HTTP_CACHE_FILE = os.path.join(MINECRAFT_DIR, "loannsmp_cache", "http.json")
+FORGE_CACHE_FILE = os.path.join(MINECRAFT_DIR, "loannsmp_cache", "forge.json")
+MOD_INDEX_FILE = os.path.join(MINECRAFT_DIR, "loannsmp_cache", "mods_index.json")
+MOD_ICONS_DIR = os.path.join(MINECRAFT_DIR, "loannsmp_cache", "icons")
+GAME_LOGS_DIR = os.path.join(MINECRAFT_DIR, "loannsmp_logs")
+TRASH_DIR = os.path.join(MINECRAFT_DIR, "loannsmp_trash")
+MC_VERSION = "1.20.1"
+INSTALLED_FORGE_VERSION = None
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 Mo par lecture réseau / écriture disque
+
+
+# ========== HTTP ==========
+
+# Une seule session par processus : les connexions TLS vers l'hôte du pack
+# sont gardées ouvertes et réutilisées par toutes les requêtes
+_http_session = None
+_http_lock = threading.Lock()
+
+
+def get_session():
+    global _http_session
+    with _http_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            _http_session.mount('https://', adapter)
+            _http_session.mount('http://', adapter)
+        return _http_session
+
+
+# GET conditionnel pour les petits fichiers de métadonnées (modpack.txt,
+# manifest.json) : le corps est gardé sur disque avec son ETag / Last-Modified
+# et un fichier inchangé ne coûte qu'un 304
+def fetch_text(url, timeout=10):
+    with _http_lock:
+        try:
+            with open(HTTP_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except:
+            cache = {}
+    cached = cache.get(url)
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    
+    resp = get_session().get(url, timeout=timeout, headers=headers)
+    if resp.status_code == 304 and cached:
+        return cached['body']
+    resp.raise_for_status()
+    if resp.encoding is None:
+        resp.encoding = 'utf-8'
+    body = resp.text
+    etag = resp.headers.get('ETag')
+    last_modified = resp.headers.get('Last-Modified')
+    if etag or last_modified:
+        with _http_lock:
+            try:
+                with open(HTTP_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except:
+                cache = {}
+            cache[url] = {'etag': etag, 'last_modified': last_modified, 'body': body}
+            try:
+                os.makedirs(os.path.dirname(HTTP_CACHE_FILE), exist_ok=True)
+                write_json_atomic(HTTP_CACHE_FILE, cache)
+            except OSError:
+                pass
+    return body
+
+
+def fetch_modpack_url():
+    return fetch_text(CONFIG["base_url"] + "modpack.txt").strip()
+
+
+# ========== FORGE ==========
+
+# La version de Forge à utiliser est gardée sur disque pendant
+# CONFIG["forge_cache_ttl_h"] heures, et la liste des versions installées tant
+# que le dossier versions/ n'a pas changé (mtime). Un démarrage à chaud ne
+# fait donc aucun appel réseau, seulement quelques stat().
+
+def load_forge_cache():
+    try:
+        with open(FORGE_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except:
+        return {}
+
+
+def save_forge_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(FORGE_CACHE_FILE), exist_ok=True)
+        write_json_atomic(FORGE_CACHE_FILE, cache)
+    except OSError:
+        pass
+
+
+def resolve_forge_version(refresh=False):
+    cache = load_forge_cache()
+    resolved = cache.get('resolved', {})
+    fresh = time.time() - resolved.get('at', 0) < CONFIG["forge_cache_ttl_h"] * 3600
+    if not refresh and fresh and resolved.get('mc_version') == MC_VERSION and resolved.get('forge_version'):
+        return resolved['forge_version']
+    try:
+        forge_version = mll.forge.find_forge_version(MC_VERSION)
+    except Exception:
+        # Hors ligne : une version périmée vaut mieux que pas de version
+        if resolved.get('mc_version') == MC_VERSION and resolved.get('forge_version'):
+            return resolved['forge_version']
+        raise
+    if forge_version:
+        cache['resolved'] = {'mc_version': MC_VERSION, 'forge_version': forge_version, 'at': time.time()}
+        save_forge_cache(cache)
+    return forge_version
+
+
+def get_installed_version_ids():
+    versions_dir = os.path.join(MINECRAFT_DIR, "versions")
+    try:
+        mtime_ns = os.stat(versions_dir).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    cache = load_forge_cache()
+    installed = cache.get('installed', {})
+    if installed.get('mtime_ns') == mtime_ns:
+        return installed['ids']
+    ids = [v["id"] for v in mll.utils.get_installed_versions(MINECRAFT_DIR)]
+    cache['installed'] = {'mtime_ns': mtime_ns, 'ids': ids}
+    save_forge_cache(cache)
+    return ids
+
+
+def invalidate_installed_versions():
+    cache = load_forge_cache()
+    if cache.pop('installed', None) is not None:
+        save_forge_cache(cache)
+
+
+# Équivalent de mll.forge.forge_to_installed_version ("1.20.1-47.2.0" ->
+# "1.20.1-forge-47.2.0"), pour ne pas charger la lib au démarrage
+def forge_installed_id(forge_version):
+    vanilla_part, forge_part = forge_version.split("-", 1)
+    return f"{vanilla_part}-forge-{forge_part}"
+
+
+def is_forge_installed(forge_version):
+    return forge_installed_id(forge_version) in get_installed_version_ids()
+
+
+# ========== BIBLIOTHÈQUES ET ASSETS ==========
+
+# Avant l'installation de Forge, les bibliothèques, l'index et les objets
+# d'assets, le jar client et les bibliothèques de l'installeur Forge sont
+# téléchargés en parallèle (pool borné, connexions partagées, sha1 vérifié par
+# fichier, fichiers déjà présents ignorés). minecraft_launcher_lib trouve
+# ensuite tout en place et n'a plus qu'à lancer les processeurs de Forge.
+VERSION_MANIFEST_URL = "https://piston-meta.mojang.com/mc/game/version_manifest_v2.json"
+FORGE_INSTALLER_URL = "https://maven.minecraftforge.net/net/minecraftforge/forge/{version}/forge-{version}-installer.jar"
+ASSETS_URL = "https://resources.download.minecraft.net/"
+
+
+def current_os_name():
+    if sys.platform.startswith("win"):
+        return "windows"
+    if sys.platform == "darwin":
+        return "osx"
+    return "linux"
+
+
+def library_allowed(library):
+    rules = library.get("rules")
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        if "os" in rule and rule["os"].get("name") not in (None, current_os_name()):
+            continue
+        allowed = rule.get("action") == "allow"
+    return allowed
+
+
+def library_tasks(libraries):
+    tasks = []
+    for library in libraries:
+        artifact = library.get("downloads", {}).get("artifact")
+        if not library_allowed(library) or not artifact or not artifact.get("url") or not artifact.get("path"):
+            continue
+        tasks.append((artifact["url"], os.path.join(MINECRAFT_DIR, "libraries", artifact["path"]),
+                      artifact.get("sha1"), artifact.get("size")))
+    return tasks
+
+
+def fetch_verified(session, url, dest, sha1, size, on_bytes=lambda n: None, is_running=lambda: True):
+    if os.path.isfile(dest) and (size is None or os.path.getsize(dest) == size):
+        return 0
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = dest + ".part"
+    digest = hashlib.sha1()
+    written = 0
+    with session.get(url, stream=True, timeout=60) as resp:
+        resp.raise_for_status()
+        with open(tmp, 'wb') as out:
+            for chunk in resp.iter_content(64 * 1024):
+                if not is_running():
+                    break
+                out.write(chunk)
+                digest.update(chunk)
+                written += len(chunk)
+                on_bytes(len(chunk))
+    if not is_running():
+        os.remove(tmp)
+        return 0
+    if sha1 and digest.hexdigest() != sha1:
+        os.remove(tmp)
+        raise ValueError(f"sha1 invalide pour {os.path.basename(dest)}")
+    os.replace(tmp, dest)
+    return written
+
+
+def load_json_verified(session, url, dest, sha1=None, size=None):
+    fetch_verified(session, url, dest, sha1, size)
+    with open(dest, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def forge_installer_path(forge_version):
+    return os.path.join(MINECRAFT_DIR, "loannsmp_cache", f"forge-{forge_version}-installer.jar")
+
+
+# mll.forge.install_forge_version retélécharge toujours l'installeur dans un
+# dossier temporaire : le temps de l'installation, son download_file reprend
+# la copie déjà préchargée dans loannsmp_cache
+def install_forge_version(forge_version, callback):
+    installer = forge_installer_path(forge_version)
+    url = FORGE_INSTALLER_URL.format(version=forge_version)
+    forge = mll.forge
+    original = forge.download_file
+    
+    def download_file(file_url, path, *args, **kwargs):
+        if file_url == url and os.path.isfile(installer):
+            shutil.copyfile(installer, path)
+            return True
+        return original(file_url, path, *args, **kwargs)
+    
+    forge.download_file = download_file
+    try:
+        forge.install_forge_version(forge_version, MINECRAFT_DIR, callback=callback)
+    finally:
+        forge.download_file = original
+
+
+def collect_game_tasks(session, forge_version, log=lambda msg: None, is_running=lambda: True):
+    manifest = json.loads(fetch_text(VERSION_MANIFEST_URL, timeout=15))
+    entry = next(v for v in manifest["versions"] if v["id"] == MC_VERSION)
+    version_dir = os.path.join(MINECRAFT_DIR, "versions", MC_VERSION)
+    version_data = load_json_verified(session, entry["url"], os.path.join(version_dir, MC_VERSION + ".json"),
+                                      entry.get("sha1"))
+    
+    tasks = library_tasks(version_data.get("libraries", []))
+    client = version_data.get("downloads", {}).get("client")
+    if client:
+        tasks.append((client["url"], os.path.join(version_dir, MC_VERSION + ".jar"), client["sha1"], client.get("size")))
+    logging_file = version_data.get("logging", {}).get("client", {}).get("file")
+    if logging_file:
+        tasks.append((logging_file["url"], os.path.join(MINECRAFT_DIR, "assets", "log_configs", logging_file["id"]),
+                      logging_file["sha1"], logging_file.get("size")))
+    
+    index = version_data.get("assetIndex")
+    if index:
+        assets = load_json_verified(session, index["url"],
+                                    os.path.join(MINECRAFT_DIR, "assets", "indexes", version_data["assets"] + ".json"),
+                                    index["sha1"], index.get("size"))
+        seen = set()
+        for obj in assets.get("objects", {}).values():
+            h = obj["hash"]
+            if h in seen:
+                continue
+            seen.add(h)
+            tasks.append((ASSETS_URL + h[:2] + "/" + h, os.path.join(MINECRAFT_DIR, "assets", "objects", h[:2], h),
+                          h, obj.get("size")))
+    
+    # Bibliothèques de l'installeur Forge (install_profile.json + version.json)
+    import zipfile
+    installer = forge_installer_path(forge_version)
+    if not os.path.isfile(installer):
+        os.makedirs(os.path.dirname(installer), exist_ok=True)
+        if download_resumable(session, FORGE_INSTALLER_URL.format(version=forge_version), installer + ".part",
+                              is_running, log) is None:
+            return []  # annulé
+        os.replace(installer + ".part", installer)
+    with zipfile.ZipFile(installer) as z:
+        for member in ("install_profile.json", "version.json"):
+            try:
+                data = json.loads(z.read(member))
+            except KeyError:
+                continue
+            tasks.extend(library_tasks(data.get("libraries", [])))
+    return tasks
+
+
+# Retourne (fichiers téléchargés, octets, fichiers déjà présents)
+def prefetch_game_files(forge_version, is_running, tracker=None, log=lambda msg: None):
+    session = get_session()
+    tasks = {}
+    for url, dest, sha1, size in collect_game_tasks(session, forge_version, log, is_running):
+        tasks[dest] = (url, dest, sha1, size)
+    missing = [t for t in tasks.values() if not (os.path.isfile(t[1]) and (t[3] is None or os.path.getsize(t[1]) == t[3]))]
+    if tracker:
+        tracker.set_total(sum(t[3] or 0 for t in missing))
+    
+    def run_task(task):
+        if not is_running():
+            return 0
+        url, dest, sha1, size = task
+        return fetch_verified(session, url, dest, sha1, size, tracker.advance if tracker else (lambda n: None),
+                              is_running)
+    
+    downloaded = 0
+    with ThreadPoolExecutor(max_workers=CONFIG["download_workers"]) as pool:
+        for written in pool.map(run_task, missing):
+            downloaded += written
+    return len(missing), downloaded, len(tasks) - len(missing)
+
+
+# ========== TÉLÉCHARGEMENT ==========
+
+# If-Range n'accepte qu'un validateur fort : ETag non faible, sinon Last-Modified
+def range_validator(resp):
+    etag = resp.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return resp.headers.get('Last-Modified')
+
+
+# Télécharge url dans part en reprenant là où un essai précédent s'est arrêté.
+# Le validateur (ETag / Last-Modified) est gardé dans part + ".meta" : si le
+# fichier distant a changé, le serveur renvoie 200 et on repart de zéro.
+# on_progress(octets reçus, taille totale ou 0) est appelé à chaque bloc.
+# Retourne la taille finale, ou None si l'installation a été annulée.
+def download_resumable(session, url, part, is_running, log=lambda msg: None, attempts=3,
+                       on_progress=lambda done, total: None):
+    meta_path = part + ".meta"
+    for attempt in range(1, attempts + 1):
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except:
+            meta = {}
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {}
+        if offset and meta.get('url') == url and meta.get('validator'):
+            headers = {'Range': f'bytes={offset}-', 'If-Range': meta['validator']}
+        
+        try:
+            with session.get(url, stream=True, timeout=120, headers=headers) as resp:
+                if resp.status_code == 416:
+                    # Le .part ne correspond plus au fichier distant
+                    if os.path.exists(part):
+                        os.remove(part)
+                    continue
+                resp.raise_for_status()
+                length = int(resp.headers.get('content-length', 0))
+                content_range = resp.headers.get('Content-Range', '')
+                if headers and resp.status_code == 206 and content_range.startswith(f"bytes {offset}-"):
+                    mode = 'ab'
+                    log(f"↻ Reprise du téléchargement à {offset / (1024*1024):.2f} MB")
+                else:
+                    offset = 0
+                    mode = 'wb'
+                    validator = range_validator(resp)
+                    if validator and resp.headers.get('Accept-Ranges', '').lower() == 'bytes':
+                        with open(meta_path, 'w') as f:
+                            json.dump({'url': url, 'validator': validator}, f)
+                    elif os.path.exists(meta_path):
+                        os.remove(meta_path)
+                total = offset + length
+                with open(part, mode) as out:
+                    for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        if not is_running():
+                            return None
+                        out.write(chunk)
+                        offset += len(chunk)
+                        on_progress(offset, total if length else 0)
+                if length and offset < total:
+                    raise requests.ConnectionError(f"transfert interrompu à {offset}/{total} octets")
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+            return offset
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == attempts or not is_running():
+                raise
+            log(f"⚠️ Connexion interrompue ({e}), nouvelle tentative {attempt + 1}/{attempts}...")
+            time.sleep(2 * attempt)
+    raise requests.HTTPError(f"Téléchargement impossible: {url}")
+
+
+# ========== EXTRACTION ==========
+
+# Extrait les .jar du zip en parallèle. Chaque thread ouvre sa propre poignée
+# sur l'archive : zlib relâche le GIL, la décompression et les écritures
+# disque se recouvrent donc sur plusieurs cœurs. Le sha256 de chaque jar est
+# calculé au passage. Retourne ({nom: sha256}, octets, erreurs) ; si
+# is_running() devient faux, les jars restants finissent en erreur.
+def extract_jars(archive_path, dest_dir, workers, on_extracted=lambda name, size: None, is_running=lambda: True):
+    import zipfile
+    with zipfile.ZipFile(archive_path) as z:
+        members = {}
+        for info in z.infolist():
+            name = os.path.basename(info.filename)
+            if name.endswith('.jar') and not info.filename.startswith('__MACOSX'):
+                members[name] = info.filename
+    
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+    
+    def extract_one(name):
+        if not is_running():
+            raise InterruptedError("Interrompu")
+        z = getattr(local, 'zip', None)
+        if z is None:
+            z = local.zip = zipfile.ZipFile(archive_path)
+            with handles_lock:
+                handles.append(z)
+        digest = hashlib.sha256()
+        size = 0
+        with z.open(members[name]) as src, open(os.path.join(dest_dir, name), 'wb') as dst:
+            for block in iter(lambda: src.read(DOWNLOAD_CHUNK_SIZE), b''):
+                if not is_running():
+                    raise InterruptedError("Interrompu")
+                dst.write(block)
+                digest.update(block)
+                size += len(block)
+        on_extracted(name, size)
+        return digest.hexdigest(), size
+    
+    hashes = {}
+    total_bytes = 0
+    errors = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {name: pool.submit(extract_one, name) for name in members}
+            for name, future in futures.items():
+                try:
+                    hashes[name], size = future.result()
+                    total_bytes += size
+                except Exception as e:
+                    errors.append((name, e))
+    finally:
+        for z in handles:
+            z.close()
+    return hashes, total_bytes, errors
+
+
+def zip_jars_size(archive_path):
+    import zipfile
+    with zipfile.ZipFile(archive_path) as z:
+        return sum(info.file_size for info in z.infolist()
+                   if info.filename.endswith('.jar') and not info.filename.startswith('__MACOSX'))
+
+
+# ========== INSTALLATION ATOMIQUE ==========
+
+# Le nouveau pack est préparé dans STAGING_DIR puis échangé avec MODS_DIR par
+# deux renommages. L'ancien dossier reste dans PREVIOUS_MODS_DIR : le jeu ne
+# voit jamais un jeu de mods partiel et le retour arrière est instantané.
+
+def prepare_staging():
+    # Les .part d'une tentative précédente sont gardés pour la reprise
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    for entry in Path(STAGING_DIR).iterdir():
+        if entry.name.endswith(('.part', '.part.meta')):
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
+    return STAGING_DIR
+
+
+def discard_staging():
+    shutil.rmtree(STAGING_DIR, ignore_errors=True)
+
+
+def link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+# Déplace ce qui n'est pas un mod (sous-dossiers de config, fichiers ajoutés à
+# la main...) d'un dossier de mods à l'autre, pour ne rien perdre au swap
+def move_extras(src_dir, dst_dir):
+    if not os.path.isdir(src_dir):
+        return
+    for entry in Path(src_dir).iterdir():
+        if entry.name.endswith(('.jar', '.part', '.part.meta')):
+            continue
+        target = os.path.join(dst_dir, entry.name)
+        if not os.path.exists(target):
+            os.rename(entry, target)
+
+
+def write_json_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def swap_in_mods(staging, version_info):
+    if os.path.exists(PREVIOUS_MODS_DIR):
+        shutil.rmtree(PREVIOUS_MODS_DIR)
+    for entry in Path(staging).glob("*.part*"):
+        entry.unlink()
+    had_mods = os.path.exists(MODS_DIR)
+    if had_mods:
+        os.rename(MODS_DIR, PREVIOUS_MODS_DIR)
+    try:
+        os.rename(staging, MODS_DIR)
+    except OSError:
+        if had_mods:
+            os.rename(PREVIOUS_MODS_DIR, MODS_DIR)
+        raise
+    move_extras(PREVIOUS_MODS_DIR, MODS_DIR)
+    if os.path.exists(VERSION_FILE):
+        os.replace(VERSION_FILE, PREVIOUS_VERSION_FILE)
+    write_json_atomic(VERSION_FILE, version_info)
+
+
+def can_rollback():
+    return os.path.isdir(PREVIOUS_MODS_DIR)
+
+
+# Échange la version courante et la précédente (un second appel annule le premier).
+# La version restaurée est marquée "pinned" : check_installation l'accepte même
+# si modpack.txt annonce une version plus récente, jusqu'à la prochaine installation.
+def rollback_mods():
+    swap_tmp = MODS_DIR + ".swap"
+    os.rename(PREVIOUS_MODS_DIR, swap_tmp)
+    if os.path.exists(MODS_DIR):
+        os.rename(MODS_DIR, PREVIOUS_MODS_DIR)
+    os.rename(swap_tmp, MODS_DIR)
+    move_extras(PREVIOUS_MODS_DIR, MODS_DIR)
+    if os.path.exists(PREVIOUS_VERSION_FILE):
+        current = load_version_info()
+        os.replace(PREVIOUS_VERSION_FILE, VERSION_FILE)
+        if current:
+            current.pop('pinned', None)
+            write_json_atomic(PREVIOUS_VERSION_FILE, current)
+        restored = load_version_info()
+        if restored:
+            restored['pinned'] = True
+            write_json_atomic(VERSION_FILE, restored)
+
+
+def mods_pinned():
+    return bool(load_version_info().get('pinned'))
+
+
+# Un arrêt brutal entre les deux renommages laisse MODS_DIR absent :
+# on remet l'ancienne version en place
+def recover_interrupted_swap():
+    swap_tmp = MODS_DIR + ".swap"
+    if not os.path.exists(MODS_DIR):
+        for candidate in (swap_tmp, PREVIOUS_MODS_DIR):
+            if os.path.isdir(candidate):
+                os.rename(candidate, MODS_DIR)
+                logging.warning("⚠️ Installation interrompue, restauration des mods précédents")
+                return
+
+
+# Vérification rapide au démarrage : un stat() par jar de l'index, sans rien
+# lire. Retourne la liste des jars manquants, modifiés ou marqués corrompus.
+def quick_check_mods(index):
+    problems = []
+    for name, entry in index.items():
+        try:
+            st = os.stat(os.path.join(MODS_DIR, name))
+        except OSError:
+            problems.append(name)
+            continue
+        if (st.st_size != entry.get('size') or st.st_mtime_ns != entry.get('mtime_ns')
+                or entry.get('sha256') is None):
+            problems.append(name)
+    return problems
+
+
+# ========== CACHE DE JARS ==========
+
+# Stockage adressé par contenu : chaque jar est rangé sous son sha256 et
+# partagé entre les versions du pack. Une réinstallation ou un retour à une
+# ancienne version reprend les jars d'ici (lien physique ou copie) sans
+# réseau. La taille est plafonnée par CONFIG["jar_cache_max_mb"], les jars
+# les moins récemment utilisés partent en premier.
+class JarCache:
+    def __init__(self, root=JAR_CACHE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except:
+            data = {}
+        self.entries = data.get('entries', {})
+        self.totals = data.get('totals', {'hits': 0, 'misses': 0})
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+        self.pinned = set()
+    
+    def path_for(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256 + ".jar")
+    
+    def fetch(self, sha256, size, dest):
+        path = self.path_for(sha256)
+        entry = self.entries.get(sha256)
+        if entry and os.path.exists(path) and os.path.getsize(path) == size:
+            # Un jar lié physiquement peut avoir été modifié sur place depuis mods/
+            if sha256_file(path) != sha256:
+                os.remove(path)
+                del self.entries[sha256]
+                self.misses += 1
+                return False
+            link_or_copy(path, dest)
+            entry['last_used'] = time.time()
+            self.pinned.add(sha256)
+            self.hits += 1
+            self.saved_bytes += size
+            return True
+        self.misses += 1
+        return False
+    
+    def store(self, src, sha256):
+        path = self.path_for(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            link_or_copy(src, path)
+        self.entries[sha256] = {'size': os.path.getsize(path), 'last_used': time.time()}
+        self.pinned.add(sha256)
+    
+    # Les jars utilisés par l'installation en cours ne sont jamais évincés
+    def evict(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = CONFIG["jar_cache_max_mb"] * 1024 * 1024
+        total = sum(entry['size'] for entry in self.entries.values())
+        freed = 0
+        for sha256, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_used']):
+            if total <= max_bytes:
+                break
+            if sha256 in self.pinned:
+                continue
+            try:
+                os.remove(self.path_for(sha256))
+            except FileNotFoundError:
+                pass
+            del self.entries[sha256]
+            total -= entry['size']
+            freed += entry['size']
+        return freed
+    
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        self.totals['hits'] += self.hits
+        self.totals['misses'] += self.misses
+        self.hits = self.misses = 0
+        write_json_atomic(self.index_path, {'entries': self.entries, 'totals': self.totals})
+    
+    def summary(self):
+        size_mb = sum(entry['size'] for entry in self.entries.values()) / (1024*1024)
+        lookups = self.totals['hits'] + self.totals['misses']
+        rate = 100 * self.totals['hits'] / lookups if lookups else 0
+        return (f"📦 Cache: {len(self.entries)} jar(s), {size_mb:.1f} MB, "
+                f"{rate:.0f}% de succès ({self.totals['hits']}/{lookups}), "
+                f"{self.saved_bytes / (1024*1024):.1f} MB non téléchargés cette fois")
+
+
+# ========== MANIFEST ==========
+
+# manifest.json (à côté de modpack.txt) : liste JSON de
+#   {"name": "mod.jar", "size": 1234, "sha256": "...", "url": "https://..."}
+# "url" est optionnel, par défaut <base_url>/mods/<name>. Sans manifest,
+# l'installation retombe sur le zip complet pointé par modpack.txt.
+
+def fetch_manifest():
+    try:
+        entries = json.loads(fetch_text(CONFIG["base_url"] + "manifest.json", timeout=15))
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        logging.warning(f"⚠️ Manifest illisible, utilisation du zip: {e}")
+        return None
+    except Exception as e:
+        logging.warning(f"⚠️ Manifest illisible, utilisation du zip: {e}")
+        return None
+    # Manifest mal formé (pas une liste, champ manquant...) : on prend le zip
+    try:
+        if not isinstance(entries, list):
+            raise TypeError(f"liste attendue, reçu {type(entries).__name__}")
+        manifest = []
+        for entry in entries:
+            name = os.path.basename(str(entry['name']))
+            if not name.endswith('.jar') or name != entry['name']:
+                logging.warning(f"⚠️ Entrée de manifest ignorée: {entry['name']}")
+                continue
+            manifest.append({
+                'name': name,
+                'size': int(entry['size']),
+                'sha256': str(entry['sha256']).lower(),
+                'url': entry.get('url') or CONFIG["base_url"] + "mods/" + name,
+            })
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        logging.warning(f"⚠️ Manifest illisible, utilisation du zip: {e!r}")
+        return None
+    return manifest
+
+
+def load_version_info():
+    try:
+        with open(VERSION_FILE, 'r') as f:
+            return json.load(f)
+    except:
+        return {}
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_state(path, sha256):
+    st = path.stat()
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256}
+
+
+# Réutilise le hash mémorisé à la dernière installation si le fichier n'a pas
+# bougé depuis (même taille, même mtime), sinon relit le jar
+def cached_sha256(path, known):
+    st = path.stat()
+    if known and known.get('size') == st.st_size and known.get('mtime_ns') == st.st_mtime_ns:
+        return known['sha256']
+    return sha256_file(path)
+
+
+def download_jar(session, entry, dest, is_running, log=lambda msg: None, on_progress=lambda done, total: None):
+    part = dest + ".part"
+    if download_resumable(session, entry['url'], part, is_running, log, on_progress=on_progress) is None:
+        raise RuntimeError("installation annulée")
+    if os.path.getsize(part) != entry['size'] or sha256_file(part) != entry['sha256']:
+        os.remove(part)
+        raise ValueError(f"{entry['name']} corrompu (taille ou sha256 invalide)")
+    os.replace(part, dest)
+
+
+# ========== INDEX DES MODS ==========
+
+# Métadonnées de chaque jar de MODS_DIR (META-INF/mods.toml + MANIFEST.MF),
+# gardées dans loannsmp_cache/mods_index.json et relues seulement pour les
+# jars nouveaux ou modifiés (taille + mtime).
+MOD_INDEX_SCHEMA = 1
+# Fournis par le jeu lui-même, jamais par un jar de mods/
+BUILTIN_MOD_IDS = ("minecraft", "forge", "javafml", "lowcodefml", "mcp")
+# Ordre de ComparableVersion (Maven, utilisé par Forge) ; un qualificatif
+# inconnu ("mc", "forge"...) passe après la version finale et "sp"
+MAVEN_QUALIFIERS = {"alpha": -5, "a": -5, "beta": -4, "b": -4, "milestone": -3, "m": -3,
+                    "rc": -2, "cr": -2, "snapshot": -1, "": 0, "ga": 0, "final": 0, "release": 0, "sp": 1}
+MAVEN_UNKNOWN_QUALIFIER = 2
+
+
+def parse_jar_manifest(text):
+    fields = {}
+    key = None
+    for line in text.splitlines():
+        if not line.strip():
+            break  # fin de la section principale
+        if line.startswith(" ") and key:
+            fields[key] += line[1:]
+            continue
+        key, _, value = line.partition(":")
+        fields[key] = value.strip()
+    return {k: fields[k] for k in ("Implementation-Title", "Implementation-Version", "Automatic-Module-Name") if k in fields}
+
+
+def read_mod_metadata(path):
+    import zipfile
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        tomllib = None
+    entry = {'mods': [], 'dependencies': [], 'manifest': {}}
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        if "META-INF/MANIFEST.MF" in names:
+            entry['manifest'] = parse_jar_manifest(zf.read("META-INF/MANIFEST.MF").decode('utf-8', errors='replace'))
+        if "META-INF/mods.toml" not in names:
+            return entry
+        if tomllib is None:
+            entry['error'] = "tomllib indisponible"
+            return entry
+        data = tomllib.loads(zf.read("META-INF/mods.toml").decode('utf-8', errors='replace'))
+    
+    jar_version = entry['manifest'].get('Implementation-Version', '')
+    for mod in data.get('mods', []):
+        version = str(mod.get('version', ''))
+        if "${file.jarVersion}" in version:
+            version = version.replace("${file.jarVersion}", jar_version)
+        entry['mods'].append({
+            'id': mod.get('modId'),
+            'version': version,
+            'name': mod.get('displayName') or mod.get('modId'),
+            'description': str(mod.get('description', '')).strip()[:500],
+            'logo': mod.get('logoFile') or data.get('logoFile'),
+        })
+    for owner, deps in (data.get('dependencies') or {}).items():
+        for dep in deps if isinstance(deps, list) else []:
+            # 1.20.1 : mandatory=true ; NeoForge/récent : type="required"
+            required = dep.get('mandatory', dep.get('type', 'required') == 'required')
+            entry['dependencies'].append({
+                'owner': owner,
+                'id': dep.get('modId'),
+                'required': bool(required),
+                'range': str(dep.get('versionRange', '')),
+                'side': dep.get('side', 'BOTH'),
+            })
+    return entry
+
+
+def load_mod_index():
+    try:
+        with open(MOD_INDEX_FILE) as f:
+            index = json.load(f)
+        if index.get('schema') == MOD_INDEX_SCHEMA:
+            return index
+    except:
+        pass
+    return {'schema': MOD_INDEX_SCHEMA, 'jars': {}}
+
+
+# La page Mods et la préparation du lancement peuvent mettre l'index à jour
+# en même temps : une seule mise à jour à la fois
+_mod_index_lock = threading.Lock()
+
+
+# Met l'index à jour : seuls les jars nouveaux ou modifiés sont rouverts,
+# en parallèle. Retourne l'index ({'jars': {nom: entrée}}).
+def update_mod_index(log=lambda msg: None, workers=None):
+    with _mod_index_lock:
+        return _update_mod_index(log, workers)
+
+
+def _update_mod_index(log, workers):
+    start = time.perf_counter()
+    index = load_mod_index()
+    jars = index['jars']
+    current = {}
+    try:
+        with os.scandir(MODS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.jar') and entry.is_file():
+                    st = entry.stat()
+                    current[entry.name] = (entry.path, st.st_size, st.st_mtime_ns)
+    except OSError:
+        pass
+    
+    removed = [name for name in jars if name not in current]
+    for name in removed:
+        del jars[name]
+    stale = [name for name, (_, size, mtime_ns) in current.items()
+             if jars.get(name, {}).get('size') != size or jars.get(name, {}).get('mtime_ns') != mtime_ns]
+    
+    def parse(name):
+        path, size, mtime_ns = current[name]
+        try:
+            entry = read_mod_metadata(path)
+        except Exception as e:
+            entry = {'mods': [], 'dependencies': [], 'manifest': {}, 'error': str(e)}
+        entry.update(size=size, mtime_ns=mtime_ns)
+        return name, entry
+    
+    if stale:
+        with ThreadPoolExecutor(max_workers=workers or CONFIG["mod_index_workers"]) as pool:
+            for name, entry in pool.map(parse, stale):
+                jars[name] = entry
+    if stale or removed:
+        try:
+            os.makedirs(os.path.dirname(MOD_INDEX_FILE), exist_ok=True)
+            write_json_atomic(MOD_INDEX_FILE, index)
+        except OSError:
+            pass
+    log(f"🗂️ Index des mods: {len(current)} jar(s), {len(stale)} relu(s), {len(removed)} retiré(s) "
+        f"en {(time.perf_counter() - start) * 1000:.0f} ms")
+    return index
+
+
+def maven_version_key(version):
+    tokens = re.findall(r"\d+|[a-zA-Z]+", version.lower())
+    key = [(1, int(t), "") if t.isdigit() else
+           (0, MAVEN_QUALIFIERS[t], "") if t in MAVEN_QUALIFIERS else (0, MAVEN_UNKNOWN_QUALIFIER, t)
+           for t in tokens]
+    # 1.0 == 1.0.0 == 1.0-final
+    while key and key[-1] in ((1, 0, ""), (0, 0, "")):
+        key.pop()
+    return key
+
+
+def compare_versions(a, b):
+    ka, kb = maven_version_key(a), maven_version_key(b)
+    for i in range(max(len(ka), len(kb))):
+        # le côté le plus court est complété par un « zéro » du même type
+        ta = ka[i] if i < len(ka) else (kb[i][0], 0, "")
+        tb = kb[i] if i < len(kb) else (ka[i][0], 0, "")
+        if ta != tb:
+            return -1 if ta < tb else 1
+    return 0
+
+
+# Plage de version Maven de mods.toml : "[47,)", "[1.2,2.0)", "[1.0]",
+# plusieurs plages séparées par des virgules. "*", "" ou une version seule
+# (simple recommandation) acceptent tout.
+def version_in_range(version, spec):
+    spec = spec.replace(" ", "")
+    if not spec or spec == "*" or spec[0] not in "[(":
+        return True
+    for low_incl, body, high_incl in re.findall(r"([\[(])([^\])]*)([\])])", spec):
+        if "," not in body:
+            if compare_versions(version, body) == 0:
+                return True
+            continue
+        low, high = body.split(",", 1)
+        if low and (compare_versions(version, low) < 0 or (low_incl == "(" and compare_versions(version, low) == 0)):
+            continue
+        if high and (compare_versions(version, high) > 0 or (high_incl == ")" and compare_versions(version, high) == 0)):
+            continue
+        return True
+    return False
+
+
+def mod_providers(index):
+    providers = {}
+    for jar, entry in index['jars'].items():
+        for mod in entry.get('mods', []):
+            if mod.get('id'):
+                providers.setdefault(mod['id'], []).append((jar, mod.get('version', '')))
+    return providers
+
+
+# {modId: [jars]} pour les ids fournis par plusieurs jars
+def duplicate_mod_ids(index):
+    return {mod_id: [jar for jar, _ in jars] for mod_id, jars in mod_providers(index).items() if len(jars) > 1}
+
+
+def builtin_versions():
+    versions = {"minecraft": MC_VERSION}
+    if INSTALLED_FORGE_VERSION and "-" in INSTALLED_FORGE_VERSION:
+        versions["forge"] = INSTALLED_FORGE_VERSION.split("-", 1)[1]
+    return versions
+
+
+# Dépendances obligatoires absentes : [(jar, mod, dépendance, plage)]
+def missing_dependencies(index):
+    providers = mod_providers(index)
+    missing = []
+    for jar, entry in index['jars'].items():
+        for dep in entry.get('dependencies', []):
+            if (dep['required'] and dep['id'] not in providers and dep['id'] not in BUILTIN_MOD_IDS
+                    and dep.get('side', 'BOTH') != 'SERVER'):
+                missing.append((jar, dep['owner'], dep['id'], dep['range']))
+    return missing
+
+
+# Dépendances présentes mais hors de la plage demandée : [(jar, mod, dépendance, plage, version trouvée)]
+def version_mismatches(index):
+    providers = mod_providers(index)
+    builtin = builtin_versions()
+    mismatches = []
+    for jar, entry in index['jars'].items():
+        for dep in entry.get('dependencies', []):
+            if dep.get('side', 'BOTH') == 'SERVER':
+                continue
+            found = [version for _, version in providers.get(dep['id'], [])]
+            if not found and dep['id'] in builtin:
+                found = [builtin[dep['id']]]
+            # Version inconnue (${file.jarVersion} sans Implementation-Version) : rien à comparer
+            if not all(found):
+                continue
+            if found and not any(version_in_range(version, dep['range']) for version in found):
+                mismatches.append((jar, dep['owner'], dep['id'], dep['range'], found[0]))
+    return mismatches
+
+
+# Contrôle avant lancement : ne bloque pas, mais dit ce qui risque de planter
+def check_mod_index(log=lambda msg: None):
+    index = update_mod_index(log)
+    problems = 0
+    for mod_id, jars in duplicate_mod_ids(index).items():
+        log(f"⚠️ Mod « {mod_id} » présent en double: {', '.join(jars)}")
+        problems += 1
+    for jar, owner, dep, spec in missing_dependencies(index):
+        log(f"⚠️ {owner} ({jar}) a besoin de « {dep} » {spec}, absent")
+        problems += 1
+    for jar, owner, dep, spec, found in version_mismatches(index):
+        log(f"⚠️ {owner} ({jar}) demande {dep} {spec}, version installée {found}")
+        problems += 1
+    unreadable = [name for name, entry in index['jars'].items() if entry.get('error')]
+    if unreadable:
+        log(f"⚠️ Métadonnées illisibles: {', '.join(unreadable)}")
+    return index, problems
+
+
+# Miniature en cache d'un jar : le nom suit taille + mtime, un jar mis à
+# jour donne donc une nouvelle miniature sans rien invalider
+def mod_icon_cache_path(name, entry):
+    return os.path.join(MOD_ICONS_DIR, f"{name[:-4]}-{entry.get('size', 0)}-{entry.get('mtime_ns', 0)}.png")
+
+
+# Octets bruts du logoFile déclaré dans mods.toml (ou None)
+def read_mod_logo(name, entry):
+    import zipfile
+    logo = next((mod['logo'] for mod in entry.get('mods', []) if mod.get('logo')), None)
+    if not logo:
+        return None
+    try:
+        with zipfile.ZipFile(os.path.join(MODS_DIR, name)) as zf:
+            return zf.read(logo.lstrip("/"))
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+# ========== PROGRESSION ==========
+
+# Suit l'avancement d'une installation phase par phase. Chaque phase occupe une
+# tranche de la barre (start..end %) et avance en octets ou en étapes. Les
+# milliers de mises à jour par seconde des téléchargements sont regroupées :
+# au plus PROGRESS_FPS émissions par seconde traversent la file d'événements Qt.
+PROGRESS_FPS = 10
+
+
+class ProgressTracker:
+    def __init__(self, emit):
+        self.emit = emit
+        self.lock = threading.Lock()
+        self.phases = []
+        self.current = None
+        self.last_emit = 0.0
+        self.started = time.perf_counter()
+    
+    def start_phase(self, label, start, end, total=0, unit='bytes'):
+        with self.lock:
+            self._close_phase()
+            self.current = {'label': label, 'start': start, 'end': end, 'total': total,
+                            'done': 0, 'unit': unit, 't0': time.perf_counter()}
+        self.emit(start, label)
+    
+    def set_total(self, total):
+        with self.lock:
+            if self.current:
+                self.current['total'] = total
+                self.current['done'] = 0
+    
+    def update(self, done, total=None):
+        with self.lock:
+            if not self.current:
+                return
+            self.current['done'] = done
+            if total:
+                self.current['total'] = total
+            self._maybe_emit()
+    
+    def advance(self, amount):
+        with self.lock:
+            if not self.current:
+                return
+            self.current['done'] += amount
+            self._maybe_emit()
+    
+    def _maybe_emit(self):
+        now = time.perf_counter()
+        if now - self.last_emit < 1 / PROGRESS_FPS:
+            return
+        self.last_emit = now
+        phase = self.current
+        total = phase['total']
+        done = min(phase['done'], total) if total else phase['done']
+        fraction = done / total if total else 0
+        value = int(phase['start'] + (phase['end'] - phase['start']) * fraction)
+        if phase['unit'] == 'bytes':
+            elapsed = max(now - phase['t0'], 1e-6)
+            rate = done / elapsed
+            text = f"{phase['label']} {done / (1024*1024):.1f}"
+            if total:
+                text += f"/{total / (1024*1024):.1f}"
+            text += f" MB · {rate / (1024*1024):.1f} MB/s"
+            if total and rate > 0:
+                remaining = int((total - done) / rate)
+                text += f" · {remaining // 60:02d}:{remaining % 60:02d} restant"
+        else:
+            text = f"{phase['label']} {done}/{total}" if total else phase['label']
+        self.emit(value, text)
+    
+    def _close_phase(self):
+        if self.current:
+            phase = self.current
+            self.phases.append((phase['label'], time.perf_counter() - phase['t0'], phase['done'], phase['unit']))
+            self.current = None
+    
+    def summary(self):
+        with self.lock:
+            self._close_phase()
+        parts = []
+        for label, elapsed, done, unit in self.phases:
+            part = f"{label} {elapsed:.1f} s"
+            if unit == 'bytes' and done:
+                part += f" ({done / (1024*1024):.1f} MB, {done / (1024*1024) / max(elapsed, 1e-6):.1f} MB/s)"
+            parts.append(part)
+        total = time.perf_counter() - self.started
+        return f"⏱️ Phases: {' · '.join(parts)} · total {total:.1f} s"
+
+
+# ========== INSTALLATION ==========
+
+# Toute la logique d'installation, de vérification et de lancement est ici,
+# sans Qt : les QThread de launcher.py et la ligne de commande (--install,
+# --check...) appellent les mêmes fonctions avec leurs propres callbacks.
+
+# True = à jour, False = installation ou mise à jour nécessaire,
+# None = le modpack n'est pas encore disponible
+def check_installation(log=logging.info):
+    global INSTALLED_FORGE_VERSION
+    try:
+        log("🔍 Vérification de l'installation...")
+        try:
+            recover_interrupted_swap()
+        except OSError as e:
+            log(f"⚠️ Restauration impossible: {e}")
+        try:
+            remote_url = fetch_modpack_url()
+            if remote_url.lower() == "none":
+                log("⚠️ Le modpack n'est pas encore disponible")
+                return None
+        except Exception as e:
+            log(f"⚠️ Impossible de vérifier la disponibilité: {e}")
+            return False
+        
+        forge_installed = False
+        try:
+            forge_version = resolve_forge_version()
+            if forge_version:
+                forge_installed = is_forge_installed(forge_version)
+                if forge_installed:
+                    INSTALLED_FORGE_VERSION = forge_version
+                    log(f"✅ Forge {forge_version} détecté")
+        except Exception as e:
+            log(f"⚠️ Erreur vérification Forge: {e}")
+        
+        try:
+            remote_hash = hashlib.md5(remote_url.encode()).hexdigest()
+            info = load_version_info()
+            local_hash = info.get('modpack_hash')
+            
+            mods_exist = os.path.exists(MODS_DIR) and len(list(Path(MODS_DIR).glob("*.jar"))) > 0
+            problems = quick_check_mods(info.get('mods', {})) if mods_exist else []
+            
+            if local_hash == remote_hash and mods_exist and not problems and forge_installed:
+                log("✅ Installation à jour !")
+                return True
+            # Retour à la version précédente choisi par le joueur
+            if info.get('pinned') and mods_exist and not problems and forge_installed:
+                log("📌 Version précédente des mods conservée (mise à jour disponible)")
+                return True
+            if not mods_exist:
+                log("⚠️ Aucun mod installé")
+            elif problems:
+                log(f"⚠️ {len(problems)} mod(s) manquant(s) ou modifié(s): {', '.join(problems[:5])}")
+            elif local_hash != remote_hash:
+                log("⚠️ Mise à jour disponible")
+            elif not forge_installed:
+                log("⚠️ Forge non installé")
+            return False
+        except Exception as e:
+            log(f"⚠️ Impossible de vérifier la version: {e}")
+            return False
+    except Exception as e:
+        log(f"❌ Erreur vérification: {e}")
+        return False
+
+
+# Vérification complète (sha256) de l'index. Un jar corrompu voit son sha256
+# effacé de l'index : la prochaine vérification au démarrage le signale et la
+# réparation le retélécharge. Retourne la liste des jars corrompus, None si
+# interrompu.
+def verify_mods(is_running=lambda: True, log=lambda msg: None, pause=0.0):
+    info = load_version_info()
+    index = info.get('mods', {})
+    if not index:
+        return []
+    start = time.perf_counter()
+    bad = []
+    for name, entry in index.items():
+        if not is_running():
+            return None
+        path = os.path.join(MODS_DIR, name)
+        try:
+            if entry.get('sha256') is None or sha256_file(path) != entry['sha256']:
+                bad.append(name)
+        except OSError:
+            bad.append(name)
+        if pause:
+            time.sleep(pause)
+    if bad:
+        # L'index a pu être réécrit par une installation entre-temps
+        current = load_version_info()
+        if current.get('mods') == index:
+            for name in bad:
+                current['mods'][name]['sha256'] = None
+            write_json_atomic(VERSION_FILE, current)
+    else:
+        log(f"✅ {len(index)} mod(s) vérifiés (sha256) en {time.perf_counter() - start:.1f} s")
+    return bad
+
+
+class Installer:
+    def __init__(self, log=lambda msg: None, progress=lambda value, text: None, finished=lambda ok, msg: None):
+        self.log = log
+        self.progress = progress
+        self.on_finished = finished
+        self._running = True
+        self.cache = None
+        self.tracker = None
+        self.result = None
+    
+    def finished(self, ok, msg):
+        self.result = (ok, msg)
+        self.on_finished(ok, msg)
+    
+    def run(self):
+        self.tracker = ProgressTracker(self.progress)
+        try:
+            self.install()
+        finally:
+            self.log(self.tracker.summary())
+        return self.result
+    
+    def install(self):
+        global INSTALLED_FORGE_VERSION
+        try:
+            self.cache = JarCache()
+            self.log("="*70)
+            self.log("📦 TÉLÉCHARGEMENT DES MODS")
+            self.log("="*70)
+            self.tracker.start_phase("Récupération du lien...", 0, 5, unit='steps')
+            self.log("Lecture de modpack.txt...")
+            try:
+                url = fetch_modpack_url()
+                if not url:
+                    self.log("❌ modpack.txt est vide")
+                    self.finished(False, "Erreur lien modpack")
+                    return
+                if url.lower() == "none":
+                    self.log("❌ Le modpack n'est pas encore sorti")
+                    self.finished(False, "Modpack pas encore sorti")
+                    return
+                if not url.startswith(('http://', 'https://')):
+                    self.log(f"❌ URL invalide dans modpack.txt: {url}")
+                    self.finished(False, "URL invalide")
+                    return
+                self.log(f"✅ URL récupérée avec succès")
+            except Exception as e:
+                self.log(f"❌ Erreur lors de la lecture de modpack.txt: {e}")
+                self.finished(False, "Erreur URL")
+                return
+            
+            staging = prepare_staging()
+            manifest = fetch_manifest()
+            if manifest is not None:
+                self.tracker.start_phase("Mise à jour des mods...", 5, 55)
+                self.log(f"Manifest trouvé: {len(manifest)} mod(s)")
+                mods_state = self.sync_from_manifest(manifest, staging)
+                if mods_state is None:
+                    if self._running:
+                        self.finished(False, "Erreur téléchargement")
+                    return
+            else:
+                self.tracker.start_phase("Téléchargement", 5, 45)
+                self.log(f"Téléchargement du modpack...")
+                archive_path = self.download_archive(url)
+                if archive_path is None:
+                    if self._running:
+                        self.finished(False, "Erreur téléchargement")
+                    return
+                
+                self.tracker.start_phase("Extraction", 45, 55)
+                try:
+                    mods_state = self.extract_archive(archive_path, staging)
+                finally:
+                    try:
+                        os.remove(archive_path)
+                    except OSError:
+                        pass
+                if mods_state is None:
+                    discard_staging()
+                    return
+            
+            if not self._running:
+                return
+            try:
+                hash_val = hashlib.md5(url.encode()).hexdigest()
+                swap_in_mods(staging, {'modpack_hash': hash_val, 'url': url, 'mods': mods_state})
+                self.log("✅ Nouveaux mods en place (version précédente conservée)")
+            except Exception as e:
+                self.log(f"❌ Erreur lors du remplacement des mods: {e}")
+                self.finished(False, "Erreur installation")
+                return
+            
+            try:
+                freed = self.cache.evict()
+                self.cache.save()
+                self.log(self.cache.summary())
+                if freed:
+                    self.log(f"🧹 Cache: {freed / (1024*1024):.1f} MB libérés (LRU)")
+            except Exception as e:
+                self.log(f"⚠️ Erreur cache: {e}")
+            
+            self.tracker.start_phase("Recherche Forge...", 55, 60, unit='steps')
+            self.log("\n🔍 RECHERCHE DE FORGE")
+            try:
+                forge_ver = resolve_forge_version()
+                if not forge_ver:
+                    self.finished(False, "Forge introuvable")
+                    return
+                self.log(f"✅ Forge: {forge_ver}")
+            except Exception as e:
+                self.finished(False, "Erreur Forge")
+                return
+            
+            try:
+                if is_forge_installed(forge_ver):
+                    INSTALLED_FORGE_VERSION = forge_ver
+                    self.log("✅ Forge déjà installé")
+                    self.progress(100, "Terminé !")
+                    self.finished(True, "Prêt")
+                    return
+            except:
+                pass
+            
+            if CONFIG["prefetch_game_files"]:
+                self.tracker.start_phase("Bibliothèques et assets", 60, 85)
+                self.log("\n📚 TÉLÉCHARGEMENT DES BIBLIOTHÈQUES ET ASSETS")
+                try:
+                    start = time.perf_counter()
+                    count, size, present = prefetch_game_files(forge_ver, lambda: self._running, self.tracker,
+                                                               self.log)
+                    self.log(f"⏱️ {count} fichier(s), {size / (1024*1024):.1f} MB en "
+                             f"{time.perf_counter() - start:.1f} s ({present} déjà présent(s), "
+                             f"{CONFIG['download_workers']} connexions)")
+                except Exception as e:
+                    # minecraft_launcher_lib téléchargera ce qui manque lui-même
+                    self.log(f"⚠️ Préchargement incomplet: {e}")
+                if not self._running:
+                    return
+            
+            self.tracker.start_phase("Installation Forge", 85 if CONFIG["prefetch_game_files"] else 60, 100, unit='steps')
+            self.log("\n🔨 INSTALLATION DE FORGE")
+            try:
+                # minecraft_launcher_lib n'a pas d'annulation : ses callbacks,
+                # appelés à chaque fichier et processeur, interrompent l'installation
+                def check_running():
+                    if not self._running:
+                        raise InterruptedError("Installation annulée")
+                def status_cb(s):
+                    check_running()
+                    self.log(s)
+                def progress_cb(p):
+                    check_running()
+                    self.tracker.update(p)
+                callback = {
+                    "setStatus": status_cb,
+                    "setProgress": progress_cb,
+                    "setMax": lambda m: self.tracker.set_total(m)
+                }
+                install_forge_version(forge_ver, callback)
+                invalidate_installed_versions()
+                INSTALLED_FORGE_VERSION = forge_ver
+                self.log("\n🎉 INSTALLATION TERMINÉE")
+                self.progress(100, "Terminé !")
+                self.finished(True, "Prêt")
+            except Exception as e:
+                if not self._running:
+                    return
+                self.log(f"❌ Erreur: {e}")
+                self.finished(False, "Erreur Forge")
+        except Exception as e:
+            self.log(f"❌ ERREUR: {e}")
+            self.finished(False, "Erreur")
+    
+    # Mise à jour delta : seuls les jars ajoutés ou modifiés sont téléchargés,
+    # les autres sont repris de MODS_DIR par lien physique (ou copie)
+    def sync_from_manifest(self, manifest, staging):
+        try:
+            known = load_version_info().get('mods', {})
+            local = {p.name: p for p in Path(MODS_DIR).glob("*.jar")} if os.path.isdir(MODS_DIR) else {}
+            wanted = {entry['name'] for entry in manifest}
+            state = {}
+            to_fetch = []
+            for entry in manifest:
+                path = local.get(entry['name'])
+                if path is not None and path.stat().st_size == entry['size']:
+                    if cached_sha256(path, known.get(entry['name'])) == entry['sha256']:
+                        dest = Path(staging) / entry['name']
+                        link_or_copy(path, dest)
+                        self.cache.store(dest, entry['sha256'])
+                        state[entry['name']] = file_state(dest, entry['sha256'])
+                        continue
+                dest = Path(staging) / entry['name']
+                if self.cache.fetch(entry['sha256'], entry['size'], dest):
+                    state[entry['name']] = file_state(dest, entry['sha256'])
+                    self.log(f"  ⚡ {entry['name']} (cache)")
+                    continue
+                to_fetch.append(entry)
+            removed = [name for name in local if name not in wanted]
+            
+            fetch_bytes = sum(entry['size'] for entry in to_fetch)
+            self.log(f"{len(manifest) - len(to_fetch)} mod(s) à jour ou en cache, "
+                     f"{len(to_fetch)} à télécharger ({fetch_bytes / (1024*1024):.2f} MB), "
+                     f"{len(removed)} à supprimer")
+            
+            session = get_session()
+            self.tracker.start_phase("Téléchargement", 5, 55, total=fetch_bytes)
+            fetched = 0
+            for entry in to_fetch:
+                if not self._running:
+                    return None
+                dest = os.path.join(staging, entry['name'])
+                download_jar(session, entry, dest, lambda: self._running, self.log,
+                             lambda done, total, base=fetched: self.tracker.update(base + done))
+                fetched += entry['size']
+                self.cache.store(dest, entry['sha256'])
+                state[entry['name']] = file_state(Path(dest), entry['sha256'])
+                self.log(f"  ✓ {entry['name']}")
+            
+            for name in removed:
+                self.log(f"  ✗ {name}")
+            
+            self.log(f"\n✅ {len(manifest)} mod(s) prêts")
+            return state
+        except Exception as e:
+            self.log(f"❌ Erreur téléchargement: {e}")
+            return None
+    
+    # Le zip est écrit sur disque au fil de l'eau : la mémoire reste constante
+    # quelle que soit la taille du pack. Un téléchargement interrompu reste dans
+    # le .part et reprend à la tentative suivante.
+    def download_archive(self, url):
+        os.makedirs(MINECRAFT_DIR, exist_ok=True)
+        archive_path = os.path.join(MINECRAFT_DIR, "loannsmp_modpack.zip")
+        try:
+            size = download_resumable(get_session(), url, archive_path + ".part", lambda: self._running, self.log,
+                                      on_progress=self.tracker.update)
+            if size is None:
+                return None
+            os.replace(archive_path + ".part", archive_path)
+            self.log(f"✅ Téléchargement terminé: {size / (1024*1024):.2f} MB")
+            return archive_path
+        except Exception as e:
+            self.log(f"❌ Erreur téléchargement: {e}")
+            return None
+    
+    def extract_archive(self, archive_path, staging):
+        try:
+            workers = CONFIG["extract_workers"]
+            self.log(f"Extraction du ZIP ({workers} thread(s))...")
+            start = time.perf_counter()
+            def on_extracted(name, size):
+                self.log(f"  ✓ {name}")
+                self.tracker.advance(size)
+            self.tracker.set_total(zip_jars_size(archive_path))
+            hashes, total_bytes, errors = extract_jars(archive_path, staging, workers, on_extracted,
+                                                       lambda: self._running)
+            if not self._running:
+                return None
+            elapsed = time.perf_counter() - start
+            if errors:
+                for name, e in errors:
+                    self.log(f"  ❌ {name}: {e}")
+                self.finished(False, "Erreur extraction")
+                return None
+            if not hashes:
+                self.log("❌ Aucun fichier .jar trouvé")
+                self.finished(False, "Aucun mod")
+                return None
+            self.log(f"\n✅ {len(hashes)} mod(s) extrait(s)")
+            self.log(f"⏱️ Extraction: {total_bytes / (1024*1024):.1f} MB en {elapsed:.2f} s "
+                     f"({total_bytes / (1024*1024) / max(elapsed, 1e-6):.1f} MB/s, {workers} thread(s))")
+            state = {}
+            for name, sha256 in hashes.items():
+                path = Path(staging) / name
+                self.cache.store(path, sha256)
+                state[name] = file_state(path, sha256)
+            return state
+        except Exception as e:
+            self.log(f"❌ Erreur extraction: {e}")
+            self.finished(False, "Erreur extraction")
+            return None
+    
+    def stop(self):
+        self._running = False
+
+
+# Désinstallation en deux temps : les cibles sont renommées dans TRASH_DIR
+# (même disque, donc instantané), puis empty_trash les supprime en tâche de
+# fond. Ce qui reste dans la corbeille est repris au démarrage suivant.
+UNINSTALL_PARTS = ("mods", "forge", "caches")
+
+
+def move_to_trash(path):
+    os.makedirs(TRASH_DIR, exist_ok=True)
+    target = os.path.join(TRASH_DIR, f"{time.time_ns()}-{os.path.basename(path)}")
+    os.rename(path, target)
+    return target
+
+
+def uninstall_targets(parts):
+    targets = []
+    if "mods" in parts:
+        targets += [MODS_DIR, PREVIOUS_MODS_DIR, STAGING_DIR, MODS_DIR + ".swap",
+                    VERSION_FILE, PREVIOUS_VERSION_FILE]
+    if "forge" in parts:
+        versions_dir = os.path.join(MINECRAFT_DIR, "versions")
+        try:
+            with os.scandir(versions_dir) as entries:
+                targets += [entry.path for entry in entries if "forge" in entry.name.lower()]
+        except OSError:
+            pass
+    if "caches" in parts:
+        targets += [os.path.join(MINECRAFT_DIR, "loannsmp_cache")]
+    return [path for path in targets if os.path.lexists(path)]
+
+
+# Retourne le nombre d'éléments mis à la corbeille ; aucun parcours des dossiers ici
+def uninstall(parts=("mods", "forge"), log=lambda msg: None):
+    global INSTALLED_FORGE_VERSION
+    log(f"\n🗑️  DÉSINSTALLATION ({', '.join(parts)})...")
+    moved = 0
+    for path in uninstall_targets(parts):
+        move_to_trash(path)
+        log(f"✅ {os.path.basename(path)} retiré")
+        moved += 1
+    if "mods" in parts:
+        os.makedirs(MODS_DIR, exist_ok=True)
+    if "forge" in parts:
+        invalidate_installed_versions()
+        INSTALLED_FORGE_VERSION = None
+    log("✅ Terminé, suppression des fichiers en arrière-plan")
+    return moved
+
+
+def trash_pending():
+    try:
+        with os.scandir(TRASH_DIR) as entries:
+            return any(True for _ in entries)
+    except OSError:
+        return False
+
+
+# Vide la corbeille fichier par fichier ; s'arrête proprement si is_running()
+# devient faux (le reste sera repris plus tard). Retourne les octets libérés :
+# un jar lié (mods/, mods précédents, cache des jars) ne compte qu'au moment
+# où son dernier lien disparaît.
+def empty_trash(is_running=lambda: True, log=lambda msg: None, pause=0.0):
+    freed = 0
+    count = 0
+    for root, dirs, files in os.walk(TRASH_DIR, topdown=False):
+        for name in files:
+            if not is_running():
+                return freed
+            path = os.path.join(root, name)
+            size = 0
+            try:
+                st = os.lstat(path)
+                size = st.st_size if st.st_nlink <= 1 else 0
+                os.unlink(path)
+                freed += size
+            except OSError:
+                try:
+                    os.chmod(path, 0o666)  # fichiers en lecture seule sous Windows
+                    os.unlink(path)
+                    freed += size
+                except OSError as e:
+                    log(f"⚠️ Suppression impossible: {path} ({e})")
+            count += 1
+            if pause and count % 50 == 0:
+                time.sleep(pause)
+        for name in dirs:
+            try:
+                os.rmdir(os.path.join(root, name))
+            except OSError:
+                pass
+    try:
+        os.rmdir(TRASH_DIR)
+    except OSError:
+        pass
+    return freed
+
+
+def format_bytes(size):
+    for unit in ("o", "Ko", "Mo"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "o" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.2f} Go"
+
+
+# ========== SORTIE DU JEU ==========
+
+# stdout et stderr du jeu sont décodés et découpés en lignes sur un thread
+# dédié : le thread de l'interface ne fait que copier les octets reçus dans
+# une file. Toutes les lignes vont dans un journal de session tournant
+# (loannsmp_logs/session-*.log). La console ne reçoit que les avertissements,
+# les erreurs et stderr, plus au plus GAME_CONSOLE_INFO_PER_S lignes
+# ordinaires par seconde.
+GAME_CONSOLE_INFO_PER_S = 20
+GAME_LOG_LEVEL = re.compile(r"/(WARN|ERROR|FATAL)\]")
+
+
+def prune_game_logs(keep):
+    try:
+        sessions = sorted({entry.name.split('.log')[0] for entry in Path(GAME_LOGS_DIR).glob("session-*.log*")})
+    except OSError:
+        return
+    for session in sessions[:-keep] if keep else sessions:
+        for entry in Path(GAME_LOGS_DIR).glob(session + ".log*"):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+class GameOutputProcessor(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True, name="game-output")
+        os.makedirs(GAME_LOGS_DIR, exist_ok=True)
+        prune_game_logs(CONFIG["game_log_sessions"] - 1)
+        self.log_path = os.path.join(GAME_LOGS_DIR, f"session-{datetime.now().strftime('%Y%m%d-%H%M%S')}.log")
+        self.queue = queue.Queue()
+        self.decoders = {stream: codecs.getincrementaldecoder('utf-8')(errors='replace') for stream in ('out', 'err')}
+        self.partial = {'out': '', 'err': ''}
+        self.listeners = []
+        self.line_count = 0
+        self.window = 0
+        self.window_count = 0
+        self.hidden = 0
+        
+        self.file_handler = logging.handlers.RotatingFileHandler(
+            self.log_path, maxBytes=CONFIG["game_log_max_mb"] * 1024 * 1024, backupCount=3, encoding='utf-8',
+            delay=True)
+        self.file_handler.setFormatter(logging.Formatter('%(message)s'))
+        self.file_log = logging.getLogger(f"loannsmp.game.{id(self)}")
+        self.file_log.propagate = False
+        self.file_log.setLevel(logging.INFO)
+        self.file_log.addHandler(self.file_handler)
+    
+    # Appelé depuis le thread de l'interface
+    def feed(self, stream, data):
+        if data:
+            self.queue.put((stream, data))
+    
+    def close(self):
+        self.queue.put(None)
+    
+    def run(self):
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    for stream, decoder in self.decoders.items():
+                        rest = self.partial[stream] + decoder.decode(b'', final=True)
+                        if rest:
+                            self.handle_line(stream, rest.rstrip('\r'))
+                    break
+                stream, data = item
+                lines = (self.partial[stream] + self.decoders[stream].decode(data)).split('\n')
+                self.partial[stream] = lines.pop()
+                for line in lines:
+                    self.handle_line(stream, line.rstrip('\r'))
+            if self.hidden:
+                logging.info(f"… {self.hidden} ligne(s) du jeu masquée(s), journal complet: {self.log_path}")
+        finally:
+            self.file_log.removeHandler(self.file_handler)
+            self.file_handler.close()
+    
+    def handle_line(self, stream, line):
+        self.line_count += 1
+        self.file_log.info(line if stream == 'out' else f"[stderr] {line}")
+        for listener in self.listeners:
+            try:
+                listener(stream, line)
+            except Exception:
+                pass
+        
+        level = GAME_LOG_LEVEL.search(line)
+        if stream == 'err' or (level and level.group(1) != 'WARN'):
+            logging.info(f"❌ {line}")
+            return
+        if level:
+            logging.info(f"⚠️ {line}")
+            return
+        now = int(time.monotonic())
+        if now != self.window:
+            if self.hidden:
+                logging.info(f"… {self.hidden} ligne(s) masquée(s)")
+                self.hidden = 0
+            self.window = now
+            self.window_count = 0
+        if self.window_count < GAME_CONSOLE_INFO_PER_S:
+            self.window_count += 1
+            logging.info(line)
+        else:
+            self.hidden += 1
+
+
+# ========== TEMPS DE DÉMARRAGE ==========
+
+# Jalons repérés dans la sortie du jeu, dans l'ordre où ils arrivent.
+# Le premier motif qui correspond fixe le jalon (None = première ligne reçue).
+LAUNCH_MILESTONES = (
+    ("jvm", "JVM démarrée", None),
+    ("forge_start", "chargement Forge", re.compile(r"Forge mod loading, version|Loading \d+ mods")),
+    ("forge_done", "mods chargés", re.compile(r"Reloading ResourceManager|Mod loading complete")),
+    ("main_menu", "menu principal", re.compile(r"Sound engine started|Created: \d+x\d+x\d+ minecraft:textures/atlas/gui")),
+)
+LAUNCH_HISTORY_FILE = os.path.join(GAME_LOGS_DIR, "launches.jsonl")
+LAUNCH_HISTORY_AVERAGE = 10
+
+
+def load_launch_history(limit=50):
+    try:
+        with open(LAUNCH_HISTORY_FILE) as f:
+            lines = f.readlines()[-limit:]
+    except OSError:
+        return []
+    history = []
+    for line in lines:
+        try:
+            history.append(json.loads(line))
+        except ValueError:
+            pass
+    return history
+
+
+# "Dernier démarrage: 48.2 s (−3.1 s vs moy.)", moyenne sur les lancements précédents
+def last_launch_text():
+    times = [entry['milestones']['main_menu'] for entry in load_launch_history()
+             if entry.get('milestones', {}).get('main_menu')]
+    if not times:
+        return ""
+    last = times[-1]
+    previous = times[-1 - LAUNCH_HISTORY_AVERAGE:-1]
+    if not previous:
+        return f"Dernier démarrage: {last:.1f} s"
+    delta = last - sum(previous) / len(previous)
+    sign = "+" if delta >= 0 else "−"
+    return f"Dernier démarrage: {last:.1f} s ({sign}{abs(delta):.1f} s vs moy.)"
+
+
+# Écoute la sortie du jeu (thread de GameOutputProcessor) et horodate les
+# jalons depuis QProcess.start ; `on_complete` est appelé au menu principal
+class LaunchTimer:
+    def __init__(self, context, on_complete=None):
+        self.t0 = time.monotonic()
+        self.context = context
+        self.on_complete = on_complete
+        self.milestones = {}
+    
+    def __call__(self, stream, line):
+        if 'main_menu' in self.milestones:
+            return
+        elapsed = round(time.monotonic() - self.t0, 1)
+        for name, label, pattern in LAUNCH_MILESTONES:
+            if name in self.milestones:
+                continue
+            if pattern is None or pattern.search(line):
+                self.milestones[name] = elapsed
+                logging.info(f"⏱️ {label}: {elapsed:.1f} s")
+                if name == 'main_menu':
+                    self.record()
+                break
+    
+    @property
+    def startup_s(self):
+        return self.milestones.get('main_menu')
+    
+    def record(self):
+        entry = dict(self.context, date=datetime.now().isoformat(timespec='seconds'), milestones=self.milestones)
+        try:
+            os.makedirs(GAME_LOGS_DIR, exist_ok=True)
+            with open(LAUNCH_HISTORY_FILE, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+        if self.on_complete:
+            self.on_complete(last_launch_text())
+
+
+# ========== STATISTIQUES ==========
+
+# Les mesures sont prises sur un thread à part (psutil peut bloquer, surtout
+# cpu_percent avec un intervalle) ; l'interface ne lit qu'un instantané.
+STATS_INTERVAL_S = 1.0
+STATS_HISTORY = 600  # 10 minutes à 1 échantillon/s
+
+# Tampon circulaire de taille fixe sur un array('d'), avec pic et moyenne
+# calculés sur toute la session (pas seulement la fenêtre gardée)
+class RingBuffer:
+    def __init__(self, capacity=STATS_HISTORY):
+        self.data = array('d', bytes(8 * capacity))
+        self.capacity = capacity
+        self.count = 0
+        self.head = 0
+        self.total = 0.0
+        self.samples = 0
+        self.peak = 0.0
+    
+    def append(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total += value
+        self.samples += 1
+        self.peak = max(self.peak, value)
+    
+    def values(self):
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return self.data[self.head:] + self.data[:self.head]
+    
+    @property
+    def last(self):
+        return self.data[(self.head - 1) % self.capacity] if self.count else 0.0
+    
+    @property
+    def average(self):
+        return self.total / self.samples if self.samples else 0.0
+
+
+STATS_METRICS = ("cpu", "rss_mb", "uss_mb", "system_ram", "threads", "processes", "open_files",
+                 "read_mbs", "write_mbs", "io_mbs", "ctx_switches")
+STATS_SLOW_EVERY = 5  # USS et fichiers ouverts coûtent cher : un échantillon sur 5
+GAME_SESSIONS_FILE = os.path.join(GAME_LOGS_DIR, "sessions.jsonl")
+
+
+# Suit tout l'arbre de processus du jeu (lanceur intermédiaire, java, enfants) :
+# les séries sont des totaux sur l'arbre, `processes` garde le détail par pid
+class StatsSampler(threading.Thread):
+    def __init__(self, pid, interval=STATS_INTERVAL_S):
+        super().__init__(daemon=True, name="stats-sampler")
+        self.pid = pid
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.series = {name: RingBuffer() for name in STATS_METRICS}
+        self.processes = {}
+        self.names = set()
+        self.totals = {'read_mb': 0.0, 'write_mb': 0.0, 'ctx_switches': 0}
+        self.stop_event = threading.Event()
+        self.root = None
+        self.tracked = {}
+        self.counters = {}
+        self.slow = {}
+        self.tick = 0
+    
+    def stop(self):
+        self.stop_event.set()
+    
+    # Copie des séries pour l'interface : {nom: (valeurs, dernière, pic, moyenne)}
+    def snapshot(self):
+        with self.lock:
+            return {name: (buf.values(), buf.last, buf.peak, buf.average) for name, buf in self.series.items()}
+    
+    # Résumé compact de la session, écrit dans loannsmp_logs/sessions.jsonl
+    def summary(self):
+        with self.lock:
+            series = self.series
+            return {
+                'samples': series['cpu'].samples,
+                'avg_cpu': round(series['cpu'].average, 1),
+                'peak_cpu': round(series['cpu'].peak, 1),
+                'avg_rss_mb': round(series['rss_mb'].average),
+                'peak_rss_mb': round(series['rss_mb'].peak),
+                'peak_uss_mb': round(series['uss_mb'].peak),
+                'peak_threads': int(series['threads'].peak),
+                'peak_processes': int(series['processes'].peak),
+                'peak_open_files': int(series['open_files'].peak),
+                'read_mb': round(self.totals['read_mb'], 1),
+                'write_mb': round(self.totals['write_mb'], 1),
+                'ctx_switches': self.totals['ctx_switches'],
+                'process_names': sorted(self.names),
+            }
+    
+    def tree(self):
+        # Si la racine (lanceur intermédiaire) est partie, ses enfants sont
+        # rattachés ailleurs : on continue avec ceux qu'on suivait déjà
+        roots = [self.root] if self.root.is_running() else list(self.tracked.values())
+        found = {}
+        for root in roots:
+            if not root.is_running():
+                continue
+            found.setdefault(root.pid, self.tracked.get(root.pid, root))
+            try:
+                for child in root.children(recursive=True):
+                    found.setdefault(child.pid, self.tracked.get(child.pid, child))
+            except psutil.NoSuchProcess:
+                pass
+        for pid, proc in found.items():
+            if pid not in self.tracked:
+                try:
+                    proc.cpu_percent(None)  # amorce : la première valeur est toujours 0
+                    self.names.add(proc.name())
+                except psutil.Error:
+                    pass
+        self.tracked = found
+        return found
+    
+    def sample_process(self, proc, dt, slow):
+        info = {}
+        with proc.oneshot():
+            info['cpu'] = proc.cpu_percent(None)
+            info['rss_mb'] = proc.memory_info().rss / (1024 * 1024)
+            info['threads'] = proc.num_threads()
+            ctx = proc.num_ctx_switches()
+            ctx = ctx.voluntary + ctx.involuntary
+            try:
+                io = proc.io_counters()
+                io = (io.read_bytes, io.write_bytes)
+            except (AttributeError, psutil.AccessDenied):
+                io = None
+        if slow:
+            extra = {}
+            try:
+                extra['uss_mb'] = proc.memory_full_info().uss / (1024 * 1024)
+            except (AttributeError, psutil.AccessDenied):
+                pass
+            try:
+                extra['open_files'] = len(proc.open_files())
+            except psutil.AccessDenied:
+                pass
+            self.slow[proc.pid] = extra
+        info.update(self.slow.get(proc.pid, {}))
+        
+        # Débits calculés par pid : un processus qui disparaît ne fausse pas les totaux
+        previous = self.counters.get(proc.pid)
+        self.counters[proc.pid] = (io, ctx)
+        info['read_mbs'] = info['write_mbs'] = 0.0
+        info['ctx_delta'] = 0
+        if previous is not None:
+            if io is not None and previous[0] is not None:
+                info['read_mbs'] = max(io[0] - previous[0][0], 0) / dt / (1024 * 1024)
+                info['write_mbs'] = max(io[1] - previous[0][1], 0) / dt / (1024 * 1024)
+            info['ctx_delta'] = max(ctx - previous[1], 0)
+        return info
+    
+    def run(self):
+        try:
+            self.root = psutil.Process(self.pid)
+        except Exception:
+            return
+        self.tree()
+        last_t = time.monotonic()
+        while not self.stop_event.wait(self.interval):
+            now = time.monotonic()
+            dt = max(now - last_t, 1e-6)
+            last_t = now
+            slow = self.tick % STATS_SLOW_EVERY == 0
+            self.tick += 1
+            
+            procs = {}
+            for pid, proc in list(self.tree().items()):
+                try:
+                    procs[pid] = self.sample_process(proc, dt, slow)
+                except psutil.NoSuchProcess:
+                    self.tracked.pop(pid, None)
+                except Exception:
+                    pass
+            if not self.tracked:
+                break
+            for pid in list(self.counters):
+                if pid not in self.tracked:
+                    del self.counters[pid]
+                    self.slow.pop(pid, None)
+            
+            def total(key):
+                return sum(info.get(key, 0) for info in procs.values())
+            read_rate, write_rate = total('read_mbs'), total('write_mbs')
+            ctx_delta = total('ctx_delta')
+            sample = {
+                'cpu': total('cpu'),
+                'rss_mb': total('rss_mb'),
+                'uss_mb': total('uss_mb'),
+                'system_ram': psutil.virtual_memory().percent,
+                'threads': total('threads'),
+                'processes': len(procs),
+                'open_files': total('open_files'),
+                'read_mbs': read_rate,
+                'write_mbs': write_rate,
+                'io_mbs': read_rate + write_rate,
+                'ctx_switches': ctx_delta / dt,
+            }
+            with self.lock:
+                for name in STATS_METRICS:
+                    self.series[name].append(sample[name])
+                self.processes = procs
+                self.totals['read_mb'] += read_rate * dt
+                self.totals['write_mb'] += write_rate * dt
+                self.totals['ctx_switches'] += ctx_delta
+
+
+def record_game_session(summary):
+    try:
+        os.makedirs(GAME_LOGS_DIR, exist_ok=True)
+        with open(GAME_SESSIONS_FILE, 'a') as f:
+            f.write(json.dumps(summary) + "\n")
+    except OSError:
+        pass
+
+
+# ========== MÉMOIRE ==========
+
+RAM_MIN_MB = 2048
+RAM_MAX_MB = 16384
+HEAP_BASE_MB = 2048  # Minecraft + Forge sans mods
+HEAP_PER_MOD_MB = 15
+HEAP_NON_HEAP_MB = 1024  # metaspace, code cache, natif : dans le RSS mais hors -Xmx
+
+
+def load_game_sessions(limit=20):
+    try:
+        with open(GAME_SESSIONS_FILE) as f:
+            lines = f.readlines()[-limit:]
+    except OSError:
+        return []
+    sessions = []
+    for line in lines:
+        try:
+            sessions.append(json.loads(line))
+        except ValueError:
+            pass
+    return sessions
+
+
+def mods_footprint():
+    count = size = 0
+    try:
+        with os.scandir(MODS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.jar') and entry.is_file():
+                    count += 1
+                    size += entry.stat().st_size
+    except OSError:
+        pass
+    return count, size
+
+
+# Arguments -Xmx/-Xms du lancement, en Mo
+def heap_settings(log):
+    if CONFIG["ram_auto"]:
+        try:
+            xmx, xms, reasons = recommend_heap()
+            for reason in reasons:
+                log(f"   {reason}")
+            return xmx, xms
+        except Exception as e:
+            log(f"⚠️ RAM automatique indisponible ({e}), {CONFIG['ram_gb']} Go utilisés")
+    return CONFIG["ram_gb"] * 1024, CONFIG["ram_gb"] * 512
+
+
+def round_heap(mb):
+    return int(-(-mb // 512) * 512)
+
+
+# Recommande -Xmx/-Xms à partir de la mémoire de la machine, du poids du
+# modpack et des pics mesurés lors des sessions précédentes.
+# Retourne (xmx_mb, xms_mb, [raisons lisibles])
+def recommend_heap():
+    reasons = []
+    mem = psutil.virtual_memory()
+    total_mb = mem.total // (1024 * 1024)
+    available_mb = mem.available // (1024 * 1024)
+    
+    count, size = mods_footprint()
+    size_mb = size // (1024 * 1024)
+    need = HEAP_BASE_MB + HEAP_PER_MOD_MB * count + 2 * size_mb
+    reasons.append(f"{count} mods ({size_mb} Mo de jars) → besoin estimé {need / 1024:.1f} Go")
+    
+    current = load_version_info().get('modpack_hash')
+    sessions = [s for s in load_game_sessions() if s.get('peak_rss_mb')]
+    same_pack = [s for s in sessions if s.get('modpack_hash') == current]
+    history = (same_pack or sessions)[-10:]
+    if history:
+        peak = max(s['peak_rss_mb'] for s in history)
+        used = peak - HEAP_NON_HEAP_MB
+        observed = used * 1.25
+        label = "ce modpack" if same_pack else "les sessions précédentes"
+        reasons.append(f"Pic mémoire sur {label}: {peak / 1024:.1f} Go ({len(history)} session(s))")
+        if observed > need:
+            need = observed
+            reasons.append(f"→ pic + 25% de marge: {need / 1024:.1f} Go")
+        # Une sortie en erreur avec un tas presque plein ressemble à un OutOfMemoryError
+        starved = [s for s in history if s.get('exit_code') and s.get('xmx_mb')
+                   and s['peak_rss_mb'] - HEAP_NON_HEAP_MB >= 0.9 * s['xmx_mb']]
+        if starved and max(s['xmx_mb'] for s in starved) + 1024 > need:
+            need = max(s['xmx_mb'] for s in starved) + 1024
+            reasons.append(f"→ plantage avec le tas plein, +1 Go: {need / 1024:.1f} Go")
+    
+    # Le système garde au moins 2 Go (ou 25%) pour ne pas partir en swap
+    ceiling = total_mb - max(2048, total_mb // 4)
+    if need > ceiling:
+        need = ceiling
+        reasons.append(f"Limité à {ceiling / 1024:.1f} Go ({total_mb / 1024:.1f} Go au total sur la machine)")
+    if need > available_mb - 512:
+        reasons.append(f"⚠️ Seulement {available_mb / 1024:.1f} Go libres : fermez d'autres applications")
+    
+    xmx = min(round_heap(need), ceiling // 512 * 512)
+    xmx = min(max(xmx, RAM_MIN_MB), RAM_MAX_MB)
+    xms = round_heap(xmx // 2)
+    reasons.append(f"-Xmx{xmx}M -Xms{xms}M")
+    return xmx, xms, reasons
+
+
+# ========== PROFILS JVM ==========
+
+# Flags G1 dans l'esprit de ceux d'Aikar, très utilisés sur les serveurs moddés
+# (sans AlwaysPreTouch : côté client il ralentit le démarrage)
+G1_TUNED_ARGS = [
+    "-XX:+UseG1GC", "-XX:+ParallelRefProcEnabled", "-XX:MaxGCPauseMillis=200",
+    "-XX:+UnlockExperimentalVMOptions", "-XX:+DisableExplicitGC",
+    "-XX:G1NewSizePercent=30", "-XX:G1MaxNewSizePercent=40", "-XX:G1HeapRegionSize=8M",
+    "-XX:G1ReservePercent=20", "-XX:G1HeapWastePercent=5", "-XX:G1MixedGCCountTarget=4",
+    "-XX:InitiatingHeapOccupancyPercent=15", "-XX:G1MixedGCLiveThresholdPercent=90",
+    "-XX:G1RSetUpdatingPauseTimePercent=5", "-XX:SurvivorRatio=32",
+    "-XX:+PerfDisableSharedMem", "-XX:MaxTenuringThreshold=1",
+]
+
+# nom -> (libellé, arguments, version de Java minimale)
+JVM_PROFILES = {
+    "default": ("Par défaut", [], 0),
+    "g1": ("G1 optimisé", G1_TUNED_ARGS, 0),
+    "zgc": ("ZGC générationnel", ["-XX:+UseZGC", "-XX:+ZGenerational"], 21),
+    "custom": ("Personnalisé", None, 0),
+}
+GC_PAUSE_LINE = re.compile(r"Pause.*?(\d+(?:\.\d+)?)ms\s*$")
+
+
+# Version majeure de Java (8, 17, 21...), mise en cache par chemin + mtime
+# pour ne lancer `java -version` qu'une fois par installation de Java
+def java_major_version(java):
+    path = shutil.which(java) or java
+    # javaw n'écrit rien sans console : on interroge le java.exe voisin
+    if os.path.basename(path).lower() == "javaw.exe" and os.path.exists(os.path.join(os.path.dirname(path), "java.exe")):
+        path = os.path.join(os.path.dirname(path), "java.exe")
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = f"{path}|{st.st_mtime_ns}|{st.st_size}"
+    try:
+        with open(JAVA_CACHE_FILE) as f:
+            cache = json.load(f)
+    except:
+        cache = {}
+    if key in cache:
+        return cache[key]
+    
+    try:
+        out = subprocess.run([path, "-version"], capture_output=True, text=True, timeout=10,
+                             creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r'version "(\d+)(?:\.(\d+))?', out.stderr + out.stdout)
+    if not match:
+        return None
+    major = int(match.group(1))
+    if major == 1 and match.group(2):  # "1.8.0_382" -> 8
+        major = int(match.group(2))
+    cache[key] = major
+    try:
+        os.makedirs(os.path.dirname(JAVA_CACHE_FILE), exist_ok=True)
+        write_json_atomic(JAVA_CACHE_FILE, cache)
+    except OSError:
+        pass
+    return major
+
+
+# Arguments du profil choisi ; retombe sur G1 optimisé si Java est trop ancien.
+# Retourne (profil réellement utilisé, arguments)
+def jvm_profile_args(profile, java_version):
+    label, args, min_java = JVM_PROFILES.get(profile, JVM_PROFILES["default"])
+    if args is None:
+        try:
+            return profile, shlex.split(CONFIG["jvm_custom_args"])
+        except ValueError as e:
+            logging.warning(f"⚠️ Arguments JVM personnalisés invalides ({e}), profil par défaut")
+            return "default", []
+    if min_java and (java_version or 0) < min_java:
+        logging.warning(f"⚠️ {label} demande Java {min_java}+ (Java {java_version or '?'} détecté), G1 optimisé utilisé")
+        return "g1", G1_TUNED_ARGS
+    return profile, args
+
+
+def gc_log_argument(path):
+    # Guillemets : sous Windows le ':' du lecteur casserait la syntaxe de -Xlog
+    return f'-Xlog:gc,gc+phases:file="{path}":uptime'
+
+
+def parse_gc_pauses(path):
+    pauses = []
+    for log in sorted(Path(path).parent.glob(Path(path).name + "*")):
+        try:
+            with open(log, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    match = GC_PAUSE_LINE.search(line)
+                    if match:
+                        pauses.append(float(match.group(1)))
+        except OSError:
+            pass
+    if not pauses:
+        return {}
+    pauses.sort()
+    return {
+        'gc_pauses': len(pauses),
+        'gc_pause_total_ms': round(sum(pauses), 1),
+        'gc_pause_p95_ms': round(pauses[int(0.95 * (len(pauses) - 1))], 2),
+        'gc_pause_max_ms': round(pauses[-1], 2),
+    }
+
+
+# Moyennes par profil sur les sessions enregistrées, pour choisir avec des chiffres
+def jvm_profile_stats():
+    stats = {}
+    for session in load_game_sessions(limit=200):
+        profile = session.get('jvm_profile')
+        if profile:
+            stats.setdefault(profile, []).append(session)
+    lines = []
+    for profile, sessions in stats.items():
+        label = JVM_PROFILES.get(profile, (profile,))[0]
+        parts = [f"{label}: {len(sessions)} session(s)"]
+        startups = [s['startup_s'] for s in sessions if s.get('startup_s')]
+        if startups:
+            parts.append(f"démarrage {sum(startups) / len(startups):.1f} s")
+        p95 = [s['gc_pause_p95_ms'] for s in sessions if s.get('gc_pause_p95_ms') is not None]
+        if p95:
+            parts.append(f"pause GC p95 {sum(p95) / len(p95):.1f} ms")
+        worst = [s['gc_pause_max_ms'] for s in sessions if s.get('gc_pause_max_ms') is not None]
+        if worst:
+            parts.append(f"max {max(worst):.0f} ms")
+        lines.append(" • ".join(parts))
+    return lines
+
+
+# ========== COMMANDE DE LANCEMENT ==========
+
+# get_minecraft_command relit et fusionne les JSON Forge + vanilla et reconstruit
+# le classpath à chaque fois. On garde sur disque une commande « modèle »
+# générée avec des marqueurs, et on ne remplace que les champs propres au
+# lancement (pseudo, uuid, token, arguments JVM).
+LAUNCH_COMMAND_SCHEMA = 2
+LAUNCH_FIELDS = {
+    "username": "@@LOANNSMP_USERNAME@@",
+    "uuid": "@@LOANNSMP_UUID@@",
+    "token": "@@LOANNSMP_TOKEN@@",
+}
+LAUNCH_JVM_MARKER = "@@LOANNSMP_JVM@@"
+
+
+# minecraft_launcher_lib n'a pas de __version__ : on lit les métadonnées du
+# paquet, ou à défaut (exécutable sans métadonnées) la date de son __init__
+def mll_version():
+    try:
+        from importlib.metadata import version
+        return version("minecraft-launcher-lib")
+    except Exception:
+        try:
+            return f"mtime:{os.stat(mll.__file__).st_mtime_ns}"
+        except Exception:
+            return ""
+
+
+# Empreinte des JSON de version impliqués (la version et ses inheritsFrom)
+def version_fingerprint(version_id):
+    parts = [str(LAUNCH_COMMAND_SCHEMA), MINECRAFT_DIR, mll_version()]
+    try:
+        parts.append(str(os.stat(os.path.join(MINECRAFT_DIR, "runtime")).st_mtime_ns))
+    except OSError:
+        parts.append("-")
+    while version_id:
+        path = os.path.join(MINECRAFT_DIR, "versions", version_id, version_id + ".json")
+        with open(path, 'rb') as f:
+            raw = f.read()
+        st = os.stat(path)
+        parts.append(f"{version_id}|{st.st_mtime_ns}|{st.st_size}|{hashlib.sha256(raw).hexdigest()}")
+        version_id = json.loads(raw).get("inheritsFrom")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+# Empreinte des bibliothèques du classpath / module path de la commande
+def libraries_fingerprint(command):
+    digest = hashlib.sha256()
+    for flag, value in zip(command, command[1:]):
+        if flag not in ("-cp", "-p", "--module-path"):
+            continue
+        for lib in value.split(os.pathsep):
+            try:
+                st = os.stat(lib)
+                digest.update(f"{lib}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+            except OSError:
+                digest.update(f"{lib}|absent\n".encode())
+    return digest.hexdigest()
+
+
+def launch_command_template(version_id, log=lambda msg: None):
+    key = version_fingerprint(version_id)
+    try:
+        with open(LAUNCH_COMMAND_CACHE_FILE) as f:
+            cached = json.load(f)
+        command = cached['command']
+        if (cached.get('key') == key and cached.get('libraries') == libraries_fingerprint(command)
+                and (not os.path.isabs(command[0]) or os.path.exists(command[0]))):
+            log("⚡ Commande de lancement en cache")
+            return command
+    except:
+        pass
+    
+    started = time.perf_counter()
+    opts = dict(LAUNCH_FIELDS, jvmArguments=[LAUNCH_JVM_MARKER])
+    command = mll.command.get_minecraft_command(version_id, MINECRAFT_DIR, opts)
+    log(f"🔧 Commande de lancement générée en {(time.perf_counter() - started) * 1000:.0f} ms")
+    try:
+        os.makedirs(os.path.dirname(LAUNCH_COMMAND_CACHE_FILE), exist_ok=True)
+        write_json_atomic(LAUNCH_COMMAND_CACHE_FILE, {
+            'key': key, 'libraries': libraries_fingerprint(command), 'command': command})
+    except OSError:
+        pass
+    return command
+
+
+def build_launch_command(template, fields, jvm_args):
+    command = []
+    for arg in template:
+        if arg == LAUNCH_JVM_MARKER:
+            command.extend(jvm_args)
+            continue
+        for name, marker in LAUNCH_FIELDS.items():
+            arg = arg.replace(marker, fields.get(name, ""))
+        command.append(arg)
+    return command
+
+
+# ========== LANCEMENT ==========
+
+# Prépare tout le lancement : heap, commande (en cache), version de Java,
+# profil JVM et journal de session. Le dict retourné est lancé par
+# LauncherWindow.start_game (QProcess) ou par run_game (sans Qt).
+def prepare_launch(user, log=lambda msg: None):
+    started = time.perf_counter()
+    ver = mll.forge.forge_to_installed_version(INSTALLED_FORGE_VERSION)
+    xmx, xms = heap_settings(log)
+    log(f"RAM: {xmx / 1024:g} Go\n")
+    try:
+        check_mod_index(log)
+    except Exception as e:
+        log(f"⚠️ Index des mods indisponible: {e}")
+    
+    template = launch_command_template(ver, log)
+    profile, profile_args = jvm_profile_args(CONFIG["jvm_profile"], java_major_version(template[0]))
+    log(f"☕ Profil JVM: {JVM_PROFILES.get(profile, (profile,))[0]}")
+    
+    output = GameOutputProcessor()
+    gc_log_path = output.log_path + ".gc"
+    # Les arguments JVM vont avant la classe principale, juste après java
+    jvm_args = [f"-Xmx{xmx}M", f"-Xms{xms}M"] + profile_args + [gc_log_argument(gc_log_path)]
+    cmd = build_launch_command(template, {"username": user}, jvm_args)
+    log(f"⏱️ Lancement préparé en {(time.perf_counter() - started) * 1000:.0f} ms")
+    return {
+        'cmd': cmd,
+        'output': output,
+        'profile': profile,
+        'xmx': xmx,
+        'gc_log_path': gc_log_path,
+        'context': {
+            'modpack_hash': load_version_info().get('modpack_hash'),
+            'jvm_profile': profile,
+            'xmx_mb': xmx,
+        },
+    }
+
+
+def session_summary(launch, start_time, exit_code, sampler=None, startup_s=None):
+    summary = {
+        'date': start_time.isoformat(timespec='seconds'),
+        'duration_s': round((datetime.now() - start_time).total_seconds()),
+        'exit_code': exit_code,
+        'modpack_hash': launch['context']['modpack_hash'],
+        'forge': INSTALLED_FORGE_VERSION,
+        'xmx_mb': launch['xmx'],
+        'jvm_profile': launch['profile'],
+        'startup_s': startup_s,
+    }
+    if sampler is not None:
+        summary.update(sampler.summary())
+    summary.update(parse_gc_pauses(launch['gc_log_path']))
+    return summary
+
+
+# Équivalent sans Qt de LauncherWindow.start_game : attend la fin du jeu et
+# retourne le résumé de session (déjà enregistré dans sessions.jsonl)
+def run_game(launch, log=logging.info):
+    output = launch['output']
+    timer = LaunchTimer(launch['context'])
+    output.listeners.append(timer)
+    output.start()
+    log(f"📝 Journal de session: {output.log_path}")
+    
+    start_time = datetime.now()
+    process = subprocess.Popen(launch['cmd'], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    sampler = StatsSampler(process.pid)
+    sampler.start()
+    
+    def pump(stream, pipe):
+        for chunk in iter(lambda: pipe.read1(65536), b''):
+            output.feed(stream, chunk)
+    readers = [threading.Thread(target=pump, args=(stream, pipe), daemon=True)
+               for stream, pipe in (('out', process.stdout), ('err', process.stderr))]
+    for reader in readers:
+        reader.start()
+    
+    exit_code = process.wait()
+    for reader in readers:
+        reader.join()
+    output.close()
+    output.join()
+    sampler.stop()
+    
+    summary = session_summary(launch, start_time, exit_code, sampler, timer.startup_s)
+    record_game_session(summary)
+    log(f"🛑 Minecraft fermé (code {exit_code})")
+    return summary
+
+
+# ========== LIGNE DE COMMANDE ==========
+
+# python launcher.py --check | --install | --verify | --uninstall [mods,forge,caches] | --launch USER [--ram N]
+# Chaque événement est une ligne JSON sur stdout :
+#   {"event": "log", "t": 0.12, "level": "info", "message": "..."}
+#   {"event": "progress", "t": 3.4, "percent": 42, "text": "..."}
+#   {"event": "result", "t": 9.9, "command": "install", "ok": true, ...}
+CLI_COMMANDS = ("--check", "--install", "--verify", "--mods", "--uninstall", "--launch")
+
+
+def is_cli(argv):
+    return any(arg.split("=")[0] in CLI_COMMANDS for arg in argv)
+
+
+class JsonEvents:
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+    
+    def emit(self, event, **fields):
+        line = json.dumps(dict(event=event, t=round(time.perf_counter() - _STARTUP_T0, 3), **fields),
+                          ensure_ascii=False)
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class JsonLogHandler(logging.Handler):
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+    
+    def emit(self, record):
+        message = self.format(record).strip("\n")
+        if message:
+            self.events.emit("log", level=record.levelname.lower(), message=message)
+
+
+def cli_main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="launcher", description="LoannSMP Launcher sans interface : une ligne JSON par événement")
+    command = parser.add_mutually_exclusive_group(required=True)
+    command.add_argument("--check", action="store_true", help="vérifie l'installation")
+    command.add_argument("--install", action="store_true", help="installe ou met à jour les mods et Forge")
+    command.add_argument("--verify", action="store_true", help="vérifie le sha256 de tous les mods")
+    command.add_argument("--mods", action="store_true", help="met à jour l'index des mods et liste les conflits")
+    command.add_argument("--uninstall", nargs="?", const="mods,forge", metavar="PARTIES",
+                         help="supprime mods, forge et/ou caches (séparés par des virgules, défaut: mods,forge)")
+    command.add_argument("--launch", metavar="USER", help="lance le jeu et attend sa fermeture")
+    parser.add_argument("--ram", type=int, metavar="N", help="RAM en Go (désactive le mode automatique)")
+    parser.add_argument("--jvm-profile", choices=list(JVM_PROFILES), help="profil JVM pour --launch")
+    parser.add_argument("--base-url", metavar="URL", help="dépôt du modpack (modpack.txt, manifest.json)")
+    parser.add_argument("--output", metavar="FICHIER", help="écrit les événements dans un fichier plutôt que sur stdout")
+    parser.add_argument("--profile", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    stream = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    if stream is None:  # exécutable fenêtré sans console
+        return 2
+    events = JsonEvents(stream)
+    handler = JsonLogHandler(events)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.root.handlers = [handler]
+    logging.root.setLevel(logging.INFO)
+    log = logging.info
+    
+    if args.base_url:
+        CONFIG["base_url"] = args.base_url.rstrip("/") + "/"
+    if args.ram is not None:
+        CONFIG["ram_gb"] = args.ram
+        CONFIG["ram_auto"] = False
+    if args.jvm_profile:
+        CONFIG["jvm_profile"] = args.jvm_profile
+    
+    try:
+        if args.check:
+            valid = check_installation(log)
+            events.emit("result", command="check", ok=bool(valid), valid=valid,
+                        available=valid is not None, forge=INSTALLED_FORGE_VERSION)
+            return 0 if valid else 1
+        
+        if args.install:
+            installer = Installer(log, lambda value, text: events.emit("progress", percent=value, text=text))
+            try:
+                ok, msg = installer.run() or (False, "Interrompu")
+            except KeyboardInterrupt:
+                installer.stop()
+                ok, msg = False, "Interrompu"
+            phases = [{'label': label, 's': round(elapsed, 3), **({'bytes': done} if unit == 'bytes' else {})}
+                      for label, elapsed, done, unit in (installer.tracker.phases if installer.tracker else [])]
+            events.emit("result", command="install", ok=ok, message=msg, forge=INSTALLED_FORGE_VERSION,
+                        phases=phases)
+            return 0 if ok else 1
+        
+        if args.verify:
+            started = time.perf_counter()
+            missing = quick_check_mods(load_version_info().get('mods', {}))
+            corrupted = verify_mods(log=log) or []
+            events.emit("result", command="verify", ok=not missing and not corrupted,
+                        missing=missing, corrupted=corrupted, verify_s=round(time.perf_counter() - started, 3))
+            return 0 if not missing and not corrupted else 1
+        
+        if args.mods:
+            index, problems = check_mod_index(log)
+            jars = index['jars']
+            events.emit("result", command="mods", ok=problems == 0,
+                        jars=len(jars), mods=sum(len(entry.get('mods', [])) for entry in jars.values()),
+                        duplicates=duplicate_mod_ids(index),
+                        missing=[{'jar': j, 'mod': o, 'dependency': d, 'range': r}
+                                 for j, o, d, r in missing_dependencies(index)],
+                        mismatches=[{'jar': j, 'mod': o, 'dependency': d, 'range': r, 'found': f}
+                                    for j, o, d, r, f in version_mismatches(index)],
+                        unreadable={name: entry['error'] for name, entry in jars.items() if entry.get('error')})
+            return 0 if problems == 0 else 1
+        
+        if args.uninstall:
+            parts = [part.strip() for part in args.uninstall.split(",") if part.strip()]
+            unknown = [part for part in parts if part not in UNINSTALL_PARTS]
+            if unknown or not parts:
+                events.emit("result", command="uninstall", ok=False,
+                            message=f"Parties inconnues: {', '.join(unknown)} (choix: {', '.join(UNINSTALL_PARTS)})")
+                return 2
+            started = time.perf_counter()
+            moved = uninstall(parts, log)
+            freed = empty_trash(log=log)
+            log(f"♻️ {format_bytes(freed)} libérés")
+            events.emit("result", command="uninstall", ok=True, parts=parts, moved=moved,
+                        freed_bytes=freed, uninstall_s=round(time.perf_counter() - started, 3))
+            return 0
+        
+        if args.launch:
+            check_installation(log)
+            if not INSTALLED_FORGE_VERSION:
+                events.emit("result", command="launch", ok=False, message="Forge non installé, lancez --install")
+                return 1
+            summary = run_game(prepare_launch(args.launch, log), log)
+            events.emit("result", command="launch", ok=summary['exit_code'] == 0, session=summary)
+            return summary['exit_code']
+    except Exception as e:
+        events.emit("result", ok=False, message=str(e))
+        return 1
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+if __name__ == "__main__":
+    sys.exit(cli_main())
@@ -0,0 +1,60 @@
+# Comparaison de versions et plages Maven de l'index des mods (mods.toml)
+import pytest
+
+import launcher_core as core
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("1.0", "1.0.0", 0),
+    ("1.0", "1.0-final", 0),
+    ("1.0.1", "1.0", 1),
+    ("1.2", "1.10", -1),
+    ("1.0-alpha", "1.0-beta", -1),
+    ("1.0-rc1", "1.0", -1),
+    ("1.0-snapshot", "1.0", -1),
+    ("1.0-sp", "1.0", 1),
+    ("0.5.1+mc1.20.1", "0.5.1", 1),
+    ("1.0-mc1.20.1", "1.0", 1),
+    ("1.0-mc1.20.1", "1.0-sp", 1),
+    ("1.0-fabric", "1.0-forge", -1),
+    ("1.0-mc1.20.1", "1.0.1", -1),
+    ("47.3.0", "47", 1),
+])
+def test_compare_versions(a, b, expected):
+    assert core.compare_versions(a, b) == expected
+    assert core.compare_versions(b, a) == -expected
+
+
+@pytest.mark.parametrize("version, spec, expected", [
+    ("1.0", "[1.0]", True),
+    ("1.0.0", "[1.0]", True),
+    ("1.0.1", "[1.0]", False),
+    ("47.3.0", "[47,)", True),
+    ("46.0.14", "[47,)", False),
+    ("2.0", "[1,2)", False),
+    ("1.9.9", "[1,2)", True),
+    ("1.0", "(1.0,2.0]", False),
+    ("2.0", "(1.0,2.0]", True),
+    ("1.5", "(,1.0],[1.2,)", True),
+    ("1.1", "(,1.0],[1.2,)", False),
+    ("1.0-rc1", "[1.0,)", False),
+    ("0.5.1+mc1.20.1", "[0.5.1,)", True),
+    ("1.0-mc1.20.1", "[1.0,)", True),
+    ("1.20.1", "[1.20,1.21)", True),
+    ("5", "1.0", True),
+    ("5", "*", True),
+    ("5", "", True),
+])
+def test_version_in_range(version, spec, expected):
+    assert core.version_in_range(version, spec) is expected
+
+
+def test_version_mismatches_skips_unknown_versions():
+    index = {'jars': {
+        'a.jar': {'mods': [{'id': 'alpha', 'version': '1.0'}],
+                  'dependencies': [{'owner': 'alpha', 'id': 'beta', 'required': True, 'range': '[2.0,)'},
+                                   {'owner': 'alpha', 'id': 'gamma', 'required': True, 'range': '[2.0,)'}]},
+        'b.jar': {'mods': [{'id': 'beta', 'version': ''}], 'dependencies': []},
+        'c.jar': {'mods': [{'id': 'gamma', 'version': '1.5'}], 'dependencies': []},
+    }}
+    assert core.version_mismatches(index) == [('a.jar', 'alpha', 'gamma', '[2.0,)', '1.5')]